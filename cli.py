@@ -12,9 +12,47 @@ from pathlib import Path
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
+# Only lightweight modules are imported up front; the parser (Lark), semantic
+# analyzer and code generator (llvmlite) are imported where first needed so
+# that --help and --verify-mappings start quickly
+from confucio_cache import CompilationCache, ObjectCache
 from confucio_mappings import verify_mappings
-from confucio_parser import ConfucIOParser
-from confucio_semantic import SemanticAnalyzer, SemanticError
+
+
+# Shared across all files compiled in this process (see --batch)
+_parser = None
+
+
+def get_parser():
+    """Return the process-wide parser, loading the grammar on first use"""
+    global _parser
+    if _parser is None:
+        from confucio_parser import ConfucIOParser
+        # No in-process memoization: the disk cache covers reuse
+        _parser = ConfucIOParser(cache_size=0)
+    return _parser
+
+
+def read_batch_list(list_file: str):
+    """Read input paths for --batch, skipping blank lines and # comments"""
+    if list_file == '-':
+        lines = sys.stdin.read().splitlines()
+    else:
+        lines = Path(list_file).read_text(encoding='utf-8').splitlines()
+    return [Path(line.strip()) for line in lines
+            if line.strip() and not line.lstrip().startswith('#')]
+
+
+def report_cache_stats(cache: CompilationCache, object_cache: ObjectCache):
+    """Print the hit/miss counters of the caches used during this run"""
+    if cache is None and object_cache is None:
+        return
+    parts = []
+    if cache is not None:
+        parts.append(f"AST {cache.hits} hit(s) / {cache.misses} miss(es)")
+    if object_cache is not None:
+        parts.append(f"JIT objects {object_cache.hits} hit(s) / {object_cache.misses} miss(es)")
+    print(f"Cache: {', '.join(parts)}")
 
 
 def main():
@@ -29,6 +67,7 @@ Examples:
   %(prog)s program.cio --output-executable # Generate standalone binary
   %(prog)s program.cio --output-ast       # Save the AST
   %(prog)s program.cio --output-parse-tree # Save the Lark parse tree
+  %(prog)s --batch files.txt              # Run every program listed in files.txt
 '''
     )
     
@@ -53,6 +92,11 @@ Examples:
                        help='Aggressive optimization')
     parser.add_argument('--verify-mappings', action='store_true',
                        help='Verify language mappings and exit')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Do not read or write the parse tree/AST and JIT object caches')
+    parser.add_argument('--batch', metavar='LIST',
+                       help='Compile every file listed in LIST (one path per line, '
+                            '"-" for stdin) in a single process')
     
     args = parser.parse_args()
     
@@ -70,48 +114,97 @@ Examples:
             print("✗ Mapping verification failed!")
             return 1
     
+    if args.input is None and args.batch is None:
+        parser.error("an input file or --batch is required")
+    
+    cache = None if args.no_cache else CompilationCache()
+    object_cache = None if args.no_cache else ObjectCache()
+    
+    if args.batch is None:
+        status = compile_file(Path(args.input), args, cache, object_cache)
+        report_cache_stats(cache, object_cache)
+        return status
+    
+    # Batch mode: one interpreter, one grammar load, one LLVM init for all files
+    inputs = read_batch_list(args.batch)
+    if args.input is not None:
+        inputs.insert(0, Path(args.input))
+    
+    failed = []
+    for input_path in inputs:
+        print(f"\n{'=' * 60}\n{input_path}\n{'=' * 60}")
+        if compile_file(input_path, args, cache, object_cache) != 0:
+            failed.append(input_path)
+    
+    print(f"\nBatch complete: {len(inputs) - len(failed)}/{len(inputs)} succeeded")
+    report_cache_stats(cache, object_cache)
+    for input_path in failed:
+        print(f"✗ {input_path}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def compile_file(input_path: Path, args, cache: CompilationCache = None,
+                 object_cache: ObjectCache = None) -> int:
+    """Compile (and optionally run) a single Confuc-IO source file"""
+    from confucio_semantic import SemanticAnalyzer, SemanticError
+    
     # Check input file
-    input_path = Path(args.input)
     if not input_path.exists():
-        print(f"Error: Input file '{args.input}' not found", file=sys.stderr)
+        print(f"Error: Input file '{input_path}' not found", file=sys.stderr)
         return 1
     
     try:
-        # Step 1: Parse
-        print(f"Parsing {input_path.name}...")
-        confucio_parser = ConfucIOParser()
-        parse_tree = confucio_parser.parse_file(str(input_path))
-        print("✓ Parsing successful")
+        source = input_path.read_bytes()
         
-        # Save parse tree if requested
-        if args.output_parse_tree:
-            pt_file = input_path.with_suffix('.pt')
-            with open(pt_file, 'w') as f:
-                f.write(parse_tree.pretty())
-            print(f"✓ Parse tree saved to {pt_file}")
+        # Reuse the parse tree and AST from a previous run if the source is unchanged
+        cached = None
+        if cache is not None:
+            cache_key = cache.key(source)
+            cached = cache.load(cache_key)
         
-        # Step 2: Build AST
-        from confucio_ast_builder import build_ast, ASTBuilderError
+        from confucio_ast_builder import build_ast, parse_ast, ASTBuilderError
         
-        try:
-            print("\nBuilding AST...")
-            ast = build_ast(parse_tree)
-            print("✓ AST built successfully")
-        except ASTBuilderError as e:
-            print(f"✗ AST building failed: {e}")
-            return 1
+        if cached is not None:
+            parse_tree, ast = cached
+            print(f"✓ Loaded AST for {input_path.name} from cache")
+        elif args.output_parse_tree:
+            # Step 1: Parse
+            print(f"Parsing {input_path.name}...")
+            parse_tree = get_parser().parse(source.decode('utf-8'))
+            print("✓ Parsing successful")
+            
+            # Step 2: Build AST
+            try:
+                print("\nBuilding AST...")
+                ast = build_ast(parse_tree)
+                print("✓ AST built successfully")
+            except ASTBuilderError as e:
+                print(f"✗ AST building failed: {e}")
+                return 1
+            
+            if cache is not None:
+                cache.store(cache_key, parse_tree, ast)
+        else:
+            # Steps 1-2: the parse tree is not needed, so build the AST while parsing
+            print(f"Parsing {input_path.name}...")
+            try:
+                ast = parse_ast(source.decode('utf-8'))
+                print("✓ Parsing and AST building successful")
+            except ASTBuilderError as e:
+                print(f"✗ AST building failed: {e}")
+                return 1
+            parse_tree = None
+            
+            if cache is not None:
+                cache.store(cache_key, parse_tree, ast)
         
-        # Save AST if requested
-        if args.output_ast:
-            from confucio_ast import ast_to_string
-            ast_file = input_path.with_suffix('.ast')
-            with open(ast_file, 'w') as f:
-                f.write(ast_to_string(ast))
-            print(f"✓ AST saved to {ast_file}")
+        if args.output_parse_tree and parse_tree is None:
+            # Cache entry was written by a run that did not keep the parse tree
+            parse_tree = get_parser().parse(source.decode('utf-8'))
+            if cache is not None:
+                cache.store(cache_key, parse_tree, ast)
         
         # Step 3: Semantic Analysis
-        from confucio_semantic import SemanticAnalyzer, SemanticError
-        
         print("Running semantic analysis...")
         analyzer = SemanticAnalyzer()
         try:
@@ -121,11 +214,26 @@ Examples:
             print(f"✗ Semantic error: {e}", file=sys.stderr)
             return 1
         
+        # Dumps are written only once the front end has accepted the program,
+        # so the pretty-printing cost is never paid for a failing compile
+        if args.output_parse_tree:
+            pt_file = input_path.with_suffix('.pt')
+            pt_file.write_text(parse_tree.pretty(), encoding='utf-8')
+            print(f"✓ Parse tree saved to {pt_file}")
+        
+        if args.output_ast:
+            from confucio_ast import ast_to_string
+            ast_file = input_path.with_suffix('.ast')
+            ast_file.write_text(ast_to_string(ast), encoding='utf-8')
+            print(f"✓ AST saved to {ast_file}")
+        
         # Step 4: Code Generation and/or Execution
         from confucio_codegen import CodeGenerator, CodeGenError
         
         print("\nGenerating LLVM IR...")
         codegen = CodeGenerator()
+        codegen.set_jit_opt_level(args.opt_level)
+        codegen.object_cache = object_cache
         try:
             llvm_ir = codegen.generate(ast)
             print("✓ LLVM IR generated successfully")
@@ -139,8 +247,8 @@ Examples:
             # Save LLVM IR if requested
             if args.output_llvm:
                 llvm_file = input_path.with_suffix('.ll')
-                with open(llvm_file, 'w') as f:
-                    f.write(llvm_ir)
+                # Encode once and hand the whole buffer to a single write
+                llvm_file.write_bytes(llvm_ir.encode('utf-8'))
                 print(f"✓ LLVM IR saved to {llvm_file}")
             
             # Generate executable if requested (AOT compilation)
@@ -4,48 +4,67 @@ Confuc-IO Compiler Test Runner
 Runs all tests from the testing guide automatically
 """
 
+import os
+import shlex
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Tuple
+from typing import Dict, List, Tuple
 
-# Colors for output
-GREEN = '\033[92m'
-RED = '\033[91m'
-BLUE = '\033[94m'
-YELLOW = '\033[93m'
-RESET = '\033[0m'
-BOLD = '\033[1m'
+# Colors for output (disabled when stdout is not a terminal, e.g. in CI logs)
+_USE_COLOR = sys.stdout.isatty()
+GREEN = '\033[92m' if _USE_COLOR else ''
+RED = '\033[91m' if _USE_COLOR else ''
+BLUE = '\033[94m' if _USE_COLOR else ''
+YELLOW = '\033[93m' if _USE_COLOR else ''
+RESET = '\033[0m' if _USE_COLOR else ''
+BOLD = '\033[1m' if _USE_COLOR else ''
 
-def run_test(name: str, command: str, should_fail: bool = False, cwd: str = ".", use_venv: bool = True) -> Tuple[bool, str]:
-    """Run a single test command"""
-    print(f"\n{BLUE}{BOLD}{'='*70}{RESET}")
-    print(f"{BLUE}{BOLD}Test: {name}{RESET}")
-    print(f"{BLUE}{BOLD}{'='*70}{RESET}")
-    print(f"Command: {YELLOW}{command}{RESET}")
-    print()
+# Per-test output templates, built once
+_RULE = f"{BLUE}{BOLD}{'='*70}{RESET}"
+HEADER_TPL = f"\n{_RULE}\n{BLUE}{BOLD}Test: {{name}}{RESET}\n{_RULE}\nCommand: {YELLOW}{{command}}{RESET}\n\n"
+STATUS_TPL = "\n{color}" + BOLD + "Status: {status}" + RESET + "\n"
+
+@dataclass
+class TestResult:
+    """Outcome of a single test command"""
+    name: str
+    command: str
+    success: bool
+    status: str
+    stdout: str = ""
+    stderr: str = ""
+
+
+def resolve_command(command: List[str], cwd: str, use_venv: bool) -> List[str]:
+    """Swap a leading 'python3' for the venv interpreter (or this one)"""
+    if command[0] != "python3":
+        return command
+    venv_python = Path(cwd) / ".venv" / "bin" / "python3"
+    python = str(venv_python) if use_venv and venv_python.exists() else sys.executable
+    return [python] + command[1:]
+
+
+def run_test(name: str, command: List[str], should_fail: bool = False, cwd: str = ".", use_venv: bool = True) -> TestResult:
+    """Run a single test command (safe to call from worker threads; prints nothing)"""
+    display = shlex.join(command)
     
-    # Activate virtual environment if needed
-    if use_venv:
-        command = f"source .venv/bin/activate && {command}"
+    # Run the venv's interpreter directly instead of sourcing activate in a shell
+    argv = resolve_command(command, cwd, use_venv)
+    env = dict(os.environ, PYTHONPATH="src")
     
     try:
         result = subprocess.run(
-            command,
-            shell=True,
+            argv,
             cwd=cwd,
+            env=env,
             capture_output=True,
             text=True,
             timeout=10,
-            executable='/bin/bash'  # Use bash to support source command
         )
         
-        # Print output
-        if result.stdout:
-            print(result.stdout)
-        if result.stderr:
-            print(result.stderr, file=sys.stderr)
-        
         # Check if test passed
         if should_fail:
             # For error tests, we expect non-zero exit code
@@ -56,18 +75,47 @@ def run_test(name: str, command: str, should_fail: bool = False, cwd: str = ".",
             success = result.returncode == 0
             status = "PASS" if success else "FAIL"
         
-        # Print status
-        color = GREEN if success else RED
-        print(f"\n{color}{BOLD}Status: {status}{RESET}")
-        
-        return success, result.stdout + result.stderr
+        return TestResult(name, display, success, status, result.stdout, result.stderr)
         
     except subprocess.TimeoutExpired:
-        print(f"{RED}{BOLD}Status: TIMEOUT{RESET}")
-        return False, "Timeout"
+        return TestResult(name, display, False, "TIMEOUT")
     except Exception as e:
-        print(f"{RED}{BOLD}Status: ERROR - {e}{RESET}")
-        return False, str(e)
+        return TestResult(name, display, False, f"ERROR - {e}")
+
+
+def print_result(result: TestResult):
+    """Print a finished test with its header, captured output and status"""
+    report = HEADER_TPL.format(name=result.name, command=result.command)
+    if result.stdout:
+        report += result.stdout + "\n"
+    color = GREEN if result.success else RED
+    status = STATUS_TPL.format(color=color, status=result.status)
+    
+    if result.stderr:
+        # stderr goes to its own stream, after this test's header and stdout
+        # and before its status, as it always has
+        sys.stdout.write(report)
+        sys.stdout.flush()
+        sys.stderr.write(result.stderr + "\n")
+        sys.stderr.flush()
+        sys.stdout.write(status)
+    else:
+        # One write per test
+        sys.stdout.write(report + status)
+
+
+def run_all(tests: List[Tuple[str, List[str], bool]]) -> Dict[str, TestResult]:
+    """Run tests concurrently, printing each as it completes"""
+    results = {}
+    # Each test spends its time in a child process, so threads are enough
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = [executor.submit(run_test, *test) for test in tests]
+        for future in as_completed(futures):
+            result = future.result()
+            print_result(result)
+            results[result.name] = result
+    return results
+
 
 def main():
     """Run all tests from the testing guide"""
@@ -78,63 +126,34 @@ def main():
     print(RESET)
     
     tests = []
-    passed = 0
-    failed = 0
     
     # Part 1: Unit Tests
     print(f"\n{BOLD}━━━ PART 1: UNIT TESTS ━━━{RESET}")
     
-    tests.append(("Mapping Tests", "PYTHONPATH=src pytest tests/unit/test_mappings.py -v", False))
-    tests.append(("Code Generation Tests", "PYTHONPATH=src pytest tests/unit/test_codegen.py -v", False))
-    
-    # Part 2: Example Programs
-    print(f"\n{BOLD}━━━ PART 2: EXAMPLE PROGRAMS ━━━{RESET}")
-    
-    tests.append(("Hello World", "python3 cli.py examples/hello_world.cio", False))
-    tests.append(("Arithmetic", "python3 cli.py examples/arithmetic.cio", False))
-    tests.append(("Fibonacci", "python3 cli.py examples/fibonacci.cio", False))
-    tests.append(("Strings", "python3 cli.py examples/strings.cio", False))
-    tests.append(("Calculator (AST)", "python3 cli.py examples/calculator.cio --output-ast", False))
-    tests.append(("Test Params", "python3 cli.py examples/test_params.cio", False))
-    
-    # Part 3: Basic Fixtures
-    print(f"\n{BOLD}━━━ PART 3: BASIC FIXTURES ━━━{RESET}")
-    
-    tests.append(("Basic Arithmetic", "python3 cli.py tests/fixtures/basic/arithmetic.cio", False))
-    tests.append(("Basic Fibonacci", "python3 cli.py tests/fixtures/basic/fibonacci.cio", False))
+    tests.append(("Mapping Tests", ["python3", "-m", "pytest", "tests/unit/test_mappings.py", "-v"], False))
+    tests.append(("Code Generation Tests", ["python3", "-m", "pytest", "tests/unit/test_codegen.py", "-v"], False))
+    tests.append(("Cache Tests", ["python3", "-m", "pytest", "tests/unit/test_cache.py", "-v"], False))
     
-    # Part 4: Control Flow Fixtures
-    print(f"\n{BOLD}━━━ PART 4: CONTROL FLOW ━━━{RESET}")
+    # Part 2: Example and fixture programs, compiled and run in-process by
+    # pytest (one interpreter, grammar load and LLVM init for all of them)
+    print(f"\n{BOLD}━━━ PART 2: PROGRAMS (examples, fixtures, error cases) ━━━{RESET}")
     
-    tests.append(("While Loop Simple", "python3 cli.py tests/fixtures/control_flow/test_while_simple.cio", False))
+    tests.append(("Program Tests", ["python3", "-m", "pytest", "tests/integration/test_programs.py", "-v"], False))
+    # Skipping test_io.cio and the scanf fixtures - they require user input
     
-    # Part 5: String Fixtures
-    print(f"\n{BOLD}━━━ PART 5: STRING OPERATIONS ━━━{RESET}")
+    # Part 3: Code Generation
+    print(f"\n{BOLD}━━━ PART 3: CODE GENERATION ━━━{RESET}")
     
-    tests.append(("String Simple", "python3 cli.py tests/fixtures/strings/test_string_simple.cio", False))
-    tests.append(("String Concatenation", "python3 cli.py tests/fixtures/strings/test_string_concat.cio", False))
+    tests.append(("Calculator (AST)", ["python3", "cli.py", "examples/calculator.cio", "--output-ast"], False))
+    tests.append(("Generate LLVM IR", ["python3", "cli.py", "examples/calculator.cio", "--output-llvm"], False))
+    tests.append(("Generate AST", ["python3", "cli.py", "examples/fibonacci.cio", "--output-ast"], False))
     
-    # Part 6: I/O Print Tests (non-interactive)
-    print(f"\n{BOLD}━━━ PART 6: I/O PRINT TESTS ━━━{RESET}")
+    results = run_all(tests)
     
-    tests.append(("I/O Print", "python3 cli.py tests/fixtures/io/test_io_print.cio", False))
-    # Skipping test_io.cio - requires user input
-    
-    # Part 7: Code Generation
-    print(f"\n{BOLD}━━━ PART 7: CODE GENERATION ━━━{RESET}")
-    
-    tests.append(("Generate LLVM IR", "python3 cli.py examples/calculator.cio --output-llvm", False))
-    tests.append(("Generate AST", "python3 cli.py examples/fibonacci.cio --output-ast", False))
-    
-    # Note: Skipping scanf tests (require user input) and error tests (expected to fail)
-    
-    # Run all tests
-    for test_name, command, should_fail in tests:
-        success, output = run_test(test_name, command, should_fail)
-        if success:
-            passed += 1
-        else:
-            failed += 1
+    # Tally in definition order so the summary is deterministic
+    failed_names = [name for name, _, _ in tests if not results[name].success]
+    passed = len(tests) - len(failed_names)
+    failed = len(failed_names)
     
     # Print summary
     print(f"\n{BOLD}{BLUE}")
@@ -147,6 +166,8 @@ def main():
     print(f"{BOLD}Total Tests:  {total}{RESET}")
     print(f"{GREEN}{BOLD}Passed:       {passed}{RESET}")
     print(f"{RED}{BOLD}Failed:       {failed}{RESET}")
+    for name in failed_names:
+        print(f"{RED}  - {name}{RESET}")
     
     if failed == 0:
         print(f"\n{GREEN}{BOLD}🎉 ALL TESTS PASSED! 🎉{RESET}")
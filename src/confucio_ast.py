@@ -4,46 +4,47 @@ Confuc-IO Abstract Syntax Tree (AST) Node Definitions
 Defines all AST node types for representing Confuc-IO programs.
 """
 
-from dataclasses import dataclass
-from typing import List, Optional, Any
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ASTNode:
     """Base class for all AST nodes"""
-    pass
+    # Source line, 0 when unknown. Keyword-only so subclasses keep their
+    # positional fields
+    line: int = field(default=0, kw_only=True)
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Program(ASTNode):
     """Root node representing the entire program"""
     functions: List['FunctionDef']
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class FunctionDef(ASTNode):
     """Function definition"""
     return_type: str
     name: str
-    parameters: List['Parameter']
+    parameters: Sequence['Parameter']  # tuple when built by the parser
     body: List['Statement']
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Parameter(ASTNode):
     """Function parameter"""
     param_type: str
     name: str
-    line: int = 0
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Statement(ASTNode):
     """Base class for statements"""
     pass
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class VarDeclaration(Statement):
     """Variable declaration with initialization"""
     var_type: str
@@ -51,14 +52,14 @@ class VarDeclaration(Statement):
     initializer: Optional['Expression']
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Assignment(Statement):
     """Assignment statement"""
     name: str
     value: 'Expression'
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class IfStatement(Statement):
     """If statement (func keyword in Confuc-IO)"""
     condition: 'Expression'
@@ -66,14 +67,14 @@ class IfStatement(Statement):
     else_body: Optional[List[Statement]] = None
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class WhileLoop(Statement):
     """While loop (return keyword in Confuc-IO)"""
     condition: 'Expression'
     body: List[Statement]
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ForLoop(Statement):
     """For loop (if keyword in Confuc-IO)"""
     init: Statement
@@ -82,38 +83,38 @@ class ForLoop(Statement):
     body: List[Statement]
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ReturnStatement(Statement):
     """Return statement (* in Confuc-IO)"""
     value: Optional['Expression']
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ExpressionStatement(Statement):
     """Expression as a statement"""
     expression: 'Expression'
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class PrintStatement(Statement):
     """Print/output statement (FileInputStream in Confuc-IO)"""
     expressions: List['Expression']
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class InputStatement(Statement):
     """Input/scan statement (deleteSystem32 in Confuc-IO)"""
     variable_name: str
 
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Expression(ASTNode):
     """Base class for expressions"""
     pass
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class BinaryOp(Expression):
     """Binary operation"""
     operator: str  # Confuc-IO operator
@@ -121,118 +122,211 @@ class BinaryOp(Expression):
     right: Expression
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class UnaryOp(Expression):
     """Unary operation"""
     operator: str
     operand: Expression
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Literal(Expression):
     """Literal value"""
     value: Any
     literal_type: str  # 'int', 'float', 'string', 'bool'
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Identifier(Expression):
     """Variable or function reference"""
     name: str
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class FunctionCall(Expression):
     """Function call"""
     function_name: str
-    arguments: List[Expression]
+    arguments: Sequence[Expression]  # tuple when built by the parser
 
 
 def ast_to_string(node: ASTNode, indent: int = 0) -> str:
     """Pretty print AST for debugging"""
+    out: List[str] = []
+    _emit(node, indent, out)
+    return "".join(out)
+
+
+def _emit(node: ASTNode, indent: int, out: List[str]):
+    """Append the indented, newline-terminated rendering of node to out"""
+    handler = _HANDLERS.get(type(node))
+    if handler is not None:
+        handler(node, indent, out)
+    elif isinstance(node, Expression):
+        # Expressions are always rendered inline, without indentation
+        _emit_expr(node, out)
+    else:
+        out.append(f"{'  ' * indent}{node.__class__.__name__}\n")
+
+
+def _emit_expr(node: ASTNode, out: List[str]):
+    """Append the inline rendering of node to out (no indentation or newline)"""
+    handler = _EXPR_HANDLERS.get(type(node))
+    if handler is not None:
+        handler(node, out)
+    elif isinstance(node, Expression):
+        out.append(node.__class__.__name__)
+    else:
+        # Statements used inline (e.g. for-loop init/update)
+        buf: List[str] = []
+        _emit(node, 0, buf)
+        out.append("".join(buf).strip())
+
+
+def _emit_body(body: List[ASTNode], indent: int, out: List[str]):
+    for stmt in body:
+        _emit(stmt, indent, out)
+
+
+def _emit_expr_list(exprs: List['Expression'], out: List[str]):
+    for i, expr in enumerate(exprs):
+        if i:
+            out.append(", ")
+        _emit_expr(expr, out)
+
+
+# ── Statement-level formatters ──────────────────────────────────────
+
+def _fmt_program(node: Program, indent: int, out: List[str]):
+    out.append(f"{'  ' * indent}Program:\n")
+    _emit_body(node.functions, indent + 1, out)
+
+
+def _fmt_function(node: FunctionDef, indent: int, out: List[str]):
+    params_str = ", ".join(f"{p.param_type} {p.name}" for p in node.parameters)
+    out.append(f"{'  ' * indent}FunctionDef: {node.return_type} {node.name}({params_str})\n")
+    _emit_body(node.body, indent + 1, out)
+
+
+def _fmt_var_decl(node: VarDeclaration, indent: int, out: List[str]):
+    out.append(f"{'  ' * indent}VarDecl: {node.var_type} {node.name}")
+    if node.initializer:
+        out.append(" = ")
+        _emit_expr(node.initializer, out)
+    out.append("\n")
+
+
+def _fmt_assignment(node: Assignment, indent: int, out: List[str]):
+    out.append(f"{'  ' * indent}Assignment: {node.name} = ")
+    _emit_expr(node.value, out)
+    out.append("\n")
+
+
+def _fmt_if(node: IfStatement, indent: int, out: List[str]):
     prefix = "  " * indent
-    
-    if isinstance(node, Program):
-        result = f"{prefix}Program:\n"
-        for func in node.functions:
-            result += ast_to_string(func, indent + 1)
-        return result
-    
-    elif isinstance(node, FunctionDef):
-        params_str = ", ".join(f"{p.param_type} {p.name}" for p in node.parameters)
-        result = f"{prefix}FunctionDef: {node.return_type} {node.name}({params_str})\n"
-        for stmt in node.body:
-            result += ast_to_string(stmt, indent + 1)
-        return result
-    
-    elif isinstance(node, VarDeclaration):
-        result = f"{prefix}VarDecl: {node.var_type} {node.name}"
-        if node.initializer:
-            result += f" = {ast_to_string(node.initializer, 0).strip()}"
-        return result + "\n"
-    
-    elif isinstance(node, Assignment):
-        return f"{prefix}Assignment: {node.name} = {ast_to_string(node.value, 0).strip()}\n"
-    
-    elif isinstance(node, IfStatement):
-        result = f"{prefix}If: {ast_to_string(node.condition, 0).strip()}\n"
-        for stmt in node.then_body:
-            result += ast_to_string(stmt, indent + 1)
-        if node.else_body:
-            result += f"{prefix}Else:\n"
-            for stmt in node.else_body:
-                result += ast_to_string(stmt, indent + 1)
-        return result
-    
-    elif isinstance(node, WhileLoop):
-        result = f"{prefix}While: {ast_to_string(node.condition, 0).strip()}\n"
-        for stmt in node.body:
-            result += ast_to_string(stmt, indent + 1)
-        return result
-    
-    elif isinstance(node, ForLoop):
-        result = f"{prefix}For:\n"
-        result += f"{prefix}  Init: {ast_to_string(node.init, 0).strip()}\n"
-        result += f"{prefix}  Cond: {ast_to_string(node.condition, 0).strip()}\n"
-        result += f"{prefix}  Update: {ast_to_string(node.update, 0).strip()}\n"
-        result += f"{prefix}  Body:\n"
-        for stmt in node.body:
-            result += ast_to_string(stmt, indent + 2)
-        return result
-    
-    elif isinstance(node, ReturnStatement):
-        result = f"{prefix}Return"
-        if node.value:
-            result += f": {ast_to_string(node.value, 0).strip()}"
-        return result + "\n"
-    
-    elif isinstance(node, PrintStatement):
-        exprs_str = ", ".join(ast_to_string(e, 0).strip() for e in node.expressions)
-        return f"{prefix}Print: [{exprs_str}]\n"
-    
-    elif isinstance(node, InputStatement):
-        return f"{prefix}Input: {node.variable_name}\n"
-    
-    elif isinstance(node, ExpressionStatement):
-        return f"{prefix}ExprStmt: {ast_to_string(node.expression, 0).strip()}\n"
-    
-    elif isinstance(node, BinaryOp):
-        return f"({ast_to_string(node.left, 0).strip()} {node.operator} {ast_to_string(node.right, 0).strip()})"
-    
-    elif isinstance(node, UnaryOp):
-        return f"({node.operator}{ast_to_string(node.operand, 0).strip()})"
-    
-    elif isinstance(node, Literal):
-        if node.literal_type == 'string':
-            return f'"{node.value}"'
-        return f"{node.value}"
-    
-    elif isinstance(node, Identifier):
-        return f"{node.name}"
-    
-    elif isinstance(node, FunctionCall):
-        args_str = ", ".join(ast_to_string(a, 0).strip() for a in node.arguments)
-        return f"{node.function_name}({args_str})"
-    
+    out.append(f"{prefix}If: ")
+    _emit_expr(node.condition, out)
+    out.append("\n")
+    _emit_body(node.then_body, indent + 1, out)
+    if node.else_body:
+        out.append(f"{prefix}Else:\n")
+        _emit_body(node.else_body, indent + 1, out)
+
+
+def _fmt_while(node: WhileLoop, indent: int, out: List[str]):
+    out.append(f"{'  ' * indent}While: ")
+    _emit_expr(node.condition, out)
+    out.append("\n")
+    _emit_body(node.body, indent + 1, out)
+
+
+def _fmt_for(node: ForLoop, indent: int, out: List[str]):
+    prefix = "  " * indent
+    out.append(f"{prefix}For:\n{prefix}  Init: ")
+    _emit_expr(node.init, out)
+    out.append(f"\n{prefix}  Cond: ")
+    _emit_expr(node.condition, out)
+    out.append(f"\n{prefix}  Update: ")
+    _emit_expr(node.update, out)
+    out.append(f"\n{prefix}  Body:\n")
+    _emit_body(node.body, indent + 2, out)
+
+
+def _fmt_return(node: ReturnStatement, indent: int, out: List[str]):
+    out.append(f"{'  ' * indent}Return")
+    if node.value:
+        out.append(": ")
+        _emit_expr(node.value, out)
+    out.append("\n")
+
+
+def _fmt_print(node: PrintStatement, indent: int, out: List[str]):
+    out.append(f"{'  ' * indent}Print: [")
+    _emit_expr_list(node.expressions, out)
+    out.append("]\n")
+
+
+def _fmt_input(node: InputStatement, indent: int, out: List[str]):
+    out.append(f"{'  ' * indent}Input: {node.variable_name}\n")
+
+
+def _fmt_expr_stmt(node: ExpressionStatement, indent: int, out: List[str]):
+    out.append(f"{'  ' * indent}ExprStmt: ")
+    _emit_expr(node.expression, out)
+    out.append("\n")
+
+
+# ── Inline expression formatters ────────────────────────────────────
+
+def _fmt_binop(node: BinaryOp, out: List[str]):
+    out.append("(")
+    _emit_expr(node.left, out)
+    out.append(f" {node.operator} ")
+    _emit_expr(node.right, out)
+    out.append(")")
+
+
+def _fmt_unaryop(node: UnaryOp, out: List[str]):
+    out.append(f"({node.operator}")
+    _emit_expr(node.operand, out)
+    out.append(")")
+
+
+def _fmt_literal(node: Literal, out: List[str]):
+    if node.literal_type == 'string':
+        out.append(f'"{node.value}"')
     else:
-        return f"{prefix}{node.__class__.__name__}\n"
+        out.append(f"{node.value}")
+
+
+def _fmt_identifier(node: Identifier, out: List[str]):
+    out.append(node.name)
+
+
+def _fmt_call(node: FunctionCall, out: List[str]):
+    out.append(f"{node.function_name}(")
+    _emit_expr_list(node.arguments, out)
+    out.append(")")
+
+
+# Dispatch on the exact node class; AST node classes are never subclassed further
+_HANDLERS: Dict[type, Callable[[Any, int, List[str]], None]] = {
+    Program: _fmt_program,
+    FunctionDef: _fmt_function,
+    VarDeclaration: _fmt_var_decl,
+    Assignment: _fmt_assignment,
+    IfStatement: _fmt_if,
+    WhileLoop: _fmt_while,
+    ForLoop: _fmt_for,
+    ReturnStatement: _fmt_return,
+    PrintStatement: _fmt_print,
+    InputStatement: _fmt_input,
+    ExpressionStatement: _fmt_expr_stmt,
+}
+
+_EXPR_HANDLERS: Dict[type, Callable[[Any, List[str]], None]] = {
+    BinaryOp: _fmt_binop,
+    UnaryOp: _fmt_unaryop,
+    Literal: _fmt_literal,
+    Identifier: _fmt_identifier,
+    FunctionCall: _fmt_call,
+}
@@ -5,7 +5,10 @@ Transforms Lark parse tree into Confuc-IO AST nodes.
 This bridges the parser output with semantic analysis and code generation.
 """
 
-from lark import Transformer, Token
+import sys
+from functools import reduce
+from lark import Transformer, v_args
+from lark.exceptions import VisitError
 from confucio_ast import *
 
 
@@ -14,378 +17,184 @@ class ASTBuilderError(Exception):
     pass
 
 
+# Operator rules have no children, so each one transforms to a fixed symbol.
+# Interned, like the keys of OPERATOR_MAPPINGS, so codegen lookups hit on identity
+_OPERATOR_SYMBOLS = {
+    'op_assign': '@',
+    'op_eq': '@@',
+    'op_gt': '=',
+    'op_lt': '#',
+    'op_add': '/',
+    'op_sub': '~',
+    'op_mul': 'Bool',
+    'op_div': '+',
+}
+_OPERATOR_SYMBOLS = {rule: sys.intern(symbol) for rule, symbol in _OPERATOR_SYMBOLS.items()}
+
+
+# Flyweights for the most common literals. INTEGER has no sign, so the small-int
+# table starts at 0. Shared between all occurrences: never mutate a Literal.
+_SMALL_INT_MAX = 256
+_SMALL_INT_LITERALS = [Literal(value=i, literal_type='int') for i in range(_SMALL_INT_MAX + 1)]
+_TRUE_LITERAL = Literal(value=True, literal_type='bool')
+_FALSE_LITERAL = Literal(value=False, literal_type='bool')
+
+
+def _fold_binop(left, op_and_right):
+    """reduce() step for left-associative chains: (left, (op, right)) -> BinaryOp"""
+    operator, right = op_and_right
+    return BinaryOp(operator=operator, left=left, right=right)
+
+
+@v_args(inline=True)
 class ConfucIOASTBuilder(Transformer):
     """
     Lark Transformer that converts parse tree to Confuc-IO AST.
     
-    Each method corresponds to a grammar rule and returns an AST node.
+    Each method corresponds to a grammar rule and returns an AST node. Methods
+    receive the rule's children as positional arguments; delimiter rules
+    transform to None and keyword tokens are kept by Lark, so both appear as
+    (ignored) placeholders, and absent [optional] parts arrive as None.
     """
     
     # Top-level program
-    def start(self, items):
-        """start: function_def+"""
+    def start(self, *items):
+        """start: (function_def | statement)+"""
         functions = [item for item in items if isinstance(item, FunctionDef)]
         return Program(functions=functions)
     
     # Function definition
-    def function_def(self, items):
-        """function_def: type IDENTIFIER delim_lparen parameter_list? delim_rparen delim_lbrace statement* delim_rbrace"""
-        return_type = str(items[0])
-        # Convert Identifier node to string
-        name_item = items[1]
-        name = name_item.name if hasattr(name_item, 'name') else str(name_item)
-        
-        #  Find parameters and body
-        parameters = []
-        body = []
-        
-        for item in items[2:]:
-            if isinstance(item, list):
-                # Could be parameters or statements
-                if item and isinstance(item[0], Parameter):
-                    parameters = item
-                else:
-                    body.extend([s for s in item if isinstance(s, Statement)])
-            elif isinstance(item, Statement):
-                body.append(item)
-        
-        return FunctionDef(return_type=return_type, name=name, parameters=parameters, body=body)
-    
-    def parameter_list(self, items):
-        """parameter_list: parameter (COMMA parameter)*"""
-        return [item for item in items if isinstance(item, Parameter)]
-    
-    def parameter(self, items):
+    def function_def(self, return_type, name, _lparen, parameters, _rparen, body):
+        """function_def: type IDENTIFIER delim_lparen [parameter_list] delim_rparen block"""
+        return FunctionDef(return_type=return_type, name=name,
+                           parameters=parameters or (), body=body)
+    
+    def block(self, _lbrace, *statements):
+        """block: delim_lbrace statement* delim_rbrace"""
+        # statements ends with the delim_rbrace placeholder
+        return list(statements[:-1])
+    
+    def parameter_list(self, *parameters):
+        """parameter_list: parameter ("," parameter)*"""
+        # Tuples: fixed once parsed, and smaller than lists
+        return parameters
+    
+    def parameter(self, param_type, name):
         """parameter: type IDENTIFIER"""
-        param_type = str(items[0])
-        # Convert Identifier to string
-        name_item = items[1]
-        name = name_item.name if hasattr(name_item, 'name') else str(name_item)
         return Parameter(param_type=param_type, name=name)
     
     # Statements
-    def statement(self, items):
-        """statement: var_declaration | assignment | if_statement | while_loop | for_loop | return_statement | expression_statement"""
-        return items[0]
-    
-    def var_declaration(self, items):
-        """var_declaration: type IDENTIFIER (op_assign expression)?"""
-        var_type = str(items[0])
-        # Name might be an Identifier node or string
-        name_item = items[1]
-        name = name_item.name if isinstance(name_item, Identifier) else str(name_item)
-        
-        # If there's an initializer, it's after the operator
-        # items = [type, name, operator_str, expression] or [type, name]
-        # The operator returns '@' string, the expression returns an Expression node
-        initializer = None
-        for item in items[2:]:
-            # Look for Expression nodes (Literal, Identifier, BinaryOp, etc.)
-            if isinstance(item, Expression):
-                initializer = item
-                break
-        
+    def var_declaration(self, var_type, name, _op, initializer):
+        """var_declaration: type IDENTIFIER op_assign expression"""
         return VarDeclaration(var_type=var_type, name=name, initializer=initializer)
     
-    def assignment(self, items):
+    def assignment(self, name, _op, value):
         """assignment: IDENTIFIER op_assign expression"""
-        # Name might be an Identifier node or string
-        name_item = items[0]
-        name = name_item.name if isinstance(name_item, Identifier) else str(name_item)
-        
-        # Value is after the operator
-        # items = [name, operator, expression]
-        value = None
-        for item in items[1:]:
-            # Look for Expression nodes
-            if isinstance(item, Expression):
-                value = item
-                break
-        
         return Assignment(name=name, value=value)
     
-    def if_statement(self, items):
-        """if_statement: KEYWORD_FUNC delim_lparen expression delim_rparen delim_lbrace statement* delim_rbrace (ELSE delim_lbrace statement* delim_rbrace)?"""
-        # Items contains: [expression, statement*, ...]
-        # Extract the condition expression (should be first Expression node)
-        condition = None
-        statements = []
-        
-        for item in items:
-            if condition is None and isinstance(item, Expression):
-                condition = item
-            elif isinstance(item, Statement):
-                statements.append(item)
-        
-        # Split statements into then_body and else_body
-        # For now, all statements go to then_body (else not fully implemented)
-        then_body = statements
-        else_body = []
-        
-        return IfStatement(condition=condition, then_body=then_body, else_body=else_body)
-    
-    def while_loop(self, items):
-        """while_loop: KEYWORD_RETURN delim_lparen expression delim_rparen delim_lbrace statement* delim_rbrace"""
-        # Items contains: [expression, statement*, ...]
-        # Extract condition (first Expression) and body (all Statements)
-        condition = None
-        body = []
-        
-        for item in items:
-            if condition is None and isinstance(item, Expression):
-                condition = item
-            elif isinstance(item, Statement):
-                body.append(item)
-        
+    def if_statement(self, _keyword, _lparen, condition, _rparen, then_body):
+        """if_statement: KEYWORD_FUNC delim_lparen expression delim_rparen block"""
+        # The grammar has no else branch yet
+        return IfStatement(condition=condition, then_body=then_body, else_body=[])
+    
+    def while_loop(self, _keyword, _lparen, condition, _rparen, body):
+        """while_loop: KEYWORD_RETURN delim_lparen expression delim_rparen block"""
         return WhileLoop(condition=condition, body=body)
     
-    def for_loop(self, items):
-        """for_loop: KEYWORD_IF delim_lparen statement SEMICOLON expression SEMICOLON statement delim_rparen delim_lbrace statement* delim_rbrace"""
-        # Items contains: [init_statement, expression, update_statement, body_statements*]
-        # Extract in order: init (Statement), condition (Expression), update (Statement), body (Statements)
-        init = None
-        condition = None
-        update = None
-        body = []
-        
-        statements_found = 0
-        for item in items:
-            if isinstance(item, Statement):
-                if init is None:
-                    init = item
-                    statements_found += 1
-                elif update is None and statements_found == 1:
-                    update = item
-                    statements_found += 1
-                else:
-                    body.append(item)
-            elif isinstance(item, Expression) and condition is None:
-                condition = item
-        
+    def for_loop(self, _keyword, _lparen, init, condition, update, _rparen, body):
+        """for_loop: KEYWORD_IF delim_lparen assignment ";" expression ";" assignment delim_rparen block"""
         return ForLoop(init=init, condition=condition, update=update, body=body)
     
-    def return_statement(self, items):
-        """return_statement: KEYWORD_STAR expression?"""
-        # Items might be [keyword_token, expression] or just [keyword_token]
-        # Filter out strings and None
-        value = None
-        for item in items:
-            if item is not None and not isinstance(item, str) and not isinstance(item, Token):
-                value = item
-                break
+    def return_statement(self, _keyword, value):
+        """return_statement: KEYWORD_STAR [expression]"""
         return ReturnStatement(value=value)
     
-    def print_statement(self, items):
-        """print_statement: FileInputStream delim_lparen expression (COMMA expression)* delim_rparen"""
-        # Extract all Expression nodes from items
-        expressions = [item for item in items if isinstance(item, Expression)]
-        return PrintStatement(expressions=expressions)
-    
-    def input_statement(self, items):
-        """input_statement: deleteSystem32 delim_lparen IDENTIFIER delim_rparen"""
-        # Extract identifier (could be an Identifier node or Token)
-        for item in items:
-            if isinstance(item, Identifier):
-                return InputStatement(variable_name=item.name)
-            elif isinstance(item, Token) and item.type == 'IDENTIFIER':
-                return InputStatement(variable_name=item.value)
-        # Fallback: use string representation
-        var_name = str(items[0]) if items else 'unknown'
-        return InputStatement(variable_name=var_name)
-
+    def print_statement(self, _lparen, *expressions):
+        """print_statement: "FileInputStream" delim_lparen expression ("," expression)* delim_rparen"""
+        # expressions ends with the delim_rparen placeholder
+        return PrintStatement(expressions=list(expressions[:-1]))
     
-    def expression_statement(self, items):
+    def input_statement(self, _lparen, name, _rparen):
+        """input_statement: "deleteSystem32" delim_lparen IDENTIFIER delim_rparen"""
+        return InputStatement(variable_name=name)
+    
+    def expression_statement(self, expression):
         """expression_statement: expression"""
-        return ExpressionStatement(expression=items[0])
+        return ExpressionStatement(expression=expression)
     
     # Expressions
-    def expression(self, items):
-        """expression: logical_or"""
-        return items[0]
-    
-    def logical_or(self, items):
-        """logical_or: logical_and (OP_OR logical_and)*"""
-        if len(items) == 1:
-            return items[0]
-        # Build binary operation tree
-        result = items[0]
-        for i in range(1, len(items)):
-            result = BinaryOp(operator='||', left=result, right=items[i])
-        return result
-    
-    def logical_and(self, items):
-        """logical_and: equality (OP_AND equality)*"""
-        if len(items) == 1:
-            return items[0]
-        result = items[0]
-        for i in range(1, len(items)):
-            result = BinaryOp(operator='&&', left=result, right=items[i])
-        return result
-    
-    def equality(self, items):
-        """equality: comparison (op_equality comparison)*"""
-        if len(items) == 1:
-            return items[0]
-        # items should be [expr, op, expr, op, expr, ...]
-        if len(items) == 2:
-            return BinaryOp(operator=str(items[0]), left=items[0], right=items[1])
-        # For simplicity, just handle first comparison
-        return items[0]
-    
-    def comparison(self, items):
-        """comparison: additive (op_comparison additive)*"""
-        if len(items) == 1:
-            return items[0]
-        
-        # Build left-associative binary operations
-        result = items[0]
-        i = 1
-        while i < len(items):
-            if i + 1 < len(items):
-                operator = str(items[i]) if isinstance(items[i], str) else None
-                if operator:
-                    result = BinaryOp(operator=operator, left=result, right=items[i + 1])
-                    i += 2
-                else:
-                    i += 1
-            else:
-                i += 1
-        return result
-    
-    def additive(self, items):
-        """additive: multiplicative (op_add multiplicative)*"""
-        # Filter out None and Token objects
-        filtered = [item for item in items if item is not None and not isinstance(item, Token)]
-        if len(filtered) == 1:
-            return filtered[0]
-        
-        # Items are [left_expr, operator_str, right_expr]
-        # Build left-associative: ((a + b) + c)
-        result = filtered[0]
-        i = 1
-        while i + 1 < len(filtered):
-            operator = filtered[i] if isinstance(filtered[i], str) else '/'
-            right = filtered[i + 1]
-            result = BinaryOp(operator=operator, left=result, right=right)
-            i += 2
-        return result
-    
-    def multiplicative(self, items):
-        """multiplicative: unary (op_multiply unary)*"""
-        # Filter out None and Token objects
-        filtered = [item for item in items if item is not None and not isinstance(item, Token)]
-        if len(filtered) == 1:
-            return filtered[0]
-        
-        result = filtered[0]
-        i = 1
-        while i + 1 < len(filtered):
-            operator = filtered[i] if isinstance(filtered[i], str) else '+'
-            right = filtered[i + 1]
-            result = BinaryOp(operator=operator, left=result, right=right)
-            i += 2
-        return result
-    
-    def unary(self, items):
-        """unary: (OP_NOT | OP_TILDE) unary | primary"""
-        if len(items) == 1:
-            return items[0]
-        # Unary operation
-        operator = str(items[0])
-        operand = items[1]
-        return UnaryOp(operator=operator, operand=operand)
-    
-    def primary(self, items):
-        """primary: literal | IDENTIFIER | function_call | delim_lparen expression delim_rparen"""
-        # Filter out None values (from delimiters)
-        filtered = [item for item in items if item is not None]
-        return filtered[0] if filtered else items[0]
-    
-    def function_call(self, items):
-        """function_call: IDENTIFIER delim_lparen argument_list? delim_rparen"""
-        # Convert Identifier to string
-        name_item = items[0]
-        name = name_item.name if hasattr(name_item, 'name') else str(name_item)
-        
-        # Check if we have arguments
-        arguments = []
-        for item in items[1:]:
-            if isinstance(item, list):
-                arguments = item
-                break
-        
-        return FunctionCall(function_name=name, arguments=arguments)
-    
-    def argument_list(self, items):
-        """argument_list: expression (COMMA expression)*"""
-        return [item for item in items if isinstance(item, Expression)]
-    
-    def literal(self, items):
-        """literal: NUMBER | FLOAT | STRING | BOOL"""
-        # Now literals are already created by terminal handlers
-        return items[0]
+    def comparison(self, left, operator, right):
+        """comparison: additive ((op_eq | op_gt | op_lt) additive)?"""
+        # Only reached with an operator; a lone operand is inlined by the grammar
+        return BinaryOp(operator=operator, left=left, right=right)
+    
+    def additive(self, first, *rest):
+        """additive: multiplicative ((op_add | op_sub) multiplicative)*"""
+        # rest alternates operator, operand; build left-associative ((a / b) ~ c)
+        return reduce(_fold_binop, zip(rest[::2], rest[1::2]), first)
+    
+    def multiplicative(self, first, *rest):
+        """multiplicative: primary ((op_mul | op_div) primary)*"""
+        return reduce(_fold_binop, zip(rest[::2], rest[1::2]), first)
+    
+    def primary(self, _lparen, expression, _rparen):
+        """primary: ... | delim_lparen expression delim_rparen"""
+        # ?primary inlines the single-child alternatives, so only the
+        # parenthesised form reaches the transformer
+        return expression
+    
+    def identifier(self, name):
+        """primary: IDENTIFIER -> identifier"""
+        return Identifier(name=name)
+    
+    def function_call(self, name, _lparen, arguments, _rparen):
+        """function_call: IDENTIFIER delim_lparen [argument_list] delim_rparen"""
+        return FunctionCall(function_name=name, arguments=arguments or ())
+    
+    def argument_list(self, *arguments):
+        """argument_list: expression ("," expression)*"""
+        return arguments
     
     # Types
-    def type(self, items):
+    def type(self, token):
         """type: TYPE_FLOAT | TYPE_INT | TYPE_STRING | TYPE_WHILE"""
-        if isinstance(items[0], Token):
-            return items[0].value
-        return str(items[0])
+        # Interned so every node shares one string per type name
+        return sys.intern(token.value)
     
-    # Operators - these are terminal tokens, handle them directly
-    def op_assign(self, items):
-        """op_assign: OP_AT"""
-        return '@'
-    
-    def op_eq(self, items):
-        """op_eq: '@@'"""
-        return '@@'
-    
-    def op_gt(self, items):
-        """op_gt: '='"""
-        return '='
-    
-    def op_lt(self, items):
-        """op_lt: '#'"""
-        return '#'
-    
-    def op_add(self, items):
-        """op_add: '/'"""
-        return '/'
-    
-    def op_sub(self, items):
-        """op_sub: '~'"""
-        return '~'
-    
-    def op_mul(self, items):
-        """op_mul: 'Bool'"""
-        return 'Bool'
-    
-    def op_div(self, items):
-        """op_div: '+'"""
-        return '+'
+    # Operators - the rule name gives the meaning, the result is the Confuc-IO symbol
+    def __default__(self, data, children, meta):
+        """Operator rules (op_add, op_assign, ...) map straight to their symbol"""
+        symbol = _OPERATOR_SYMBOLS.get(data)
+        if symbol is not None:
+            return symbol
+        return super().__default__(data, children, meta)
     
     # Delimiters - we ignore these in the AST
-    def delim_lparen(self, items):
+    def delim_lparen(self):
         return None
     
-    def delim_rparen(self, items):
+    def delim_rparen(self):
         return None
     
-    def delim_lbrace(self, items):
+    def delim_lbrace(self):
         return None
     
-    def delim_rbrace(self, items):
+    def delim_rbrace(self):
         return None
     
     # Terminals - convert tokens to strings/values
     def IDENTIFIER(self, token):
         """Convert identifier token to string"""
-        return Identifier(name=token.value)
+        # Interned: names are repeated throughout the AST and used as dict keys.
+        # Only expression uses become Identifier nodes (see identifier())
+        return sys.intern(token.value)
     
     def INTEGER(self, token):
         """Convert integer token to Literal node"""
-        return Literal(value=int(token.value), literal_type='int')
+        value = int(token.value)
+        if value <= _SMALL_INT_MAX:
+            return _SMALL_INT_LITERALS[value]
+        return Literal(value=value, literal_type='int')
     
     def FLOAT_LITERAL(self, token):
         """Convert float token to Literal node"""
@@ -393,38 +202,16 @@ class ConfucIOASTBuilder(Transformer):
     
     def STRING_LITERAL(self, token):
         """Convert string token to Literal node"""
-        # Remove quotes
-        string_value = token.value[1:-1] if token.value.startswith('"') else token.value
-        return Literal(value=string_value, literal_type='string')
+        # The terminal always includes its surrounding quotes, "..." or '...'
+        return Literal(value=token.value[1:-1], literal_type='string')
     
     def BOOL(self, token):
         """Convert bool token to Literal node"""
-        return Literal(value=token.value.lower() == 'true', literal_type='bool')
-    
-    # Handle operator tokens directly
-    def OP_SLASH(self, token):
-        return '/'
-    
-    def OP_TILDE(self, token):
-        return '~'
-    
-    def OP_PLUS(self, token):
-        return '+'
-    
-    def OP_BOOL(self, token):
-        return 'Bool'
-    
-    def OP_EQUALS(self, token):
-        return '='
-    
-    def OP_HASH(self, token):
-        return '#'
-    
-    def OP_DOUBLE_AT(self, token):
-        return '@@'
-    
-    def OP_AT(self, token):
-        return '@'
+        return _TRUE_LITERAL if token.value.lower() == 'true' else _FALSE_LITERAL
+
+
+# The builder keeps no per-parse state, so one instance serves every call
+_BUILDER = ConfucIOASTBuilder()
 
 
 def build_ast(parse_tree):
@@ -432,16 +219,53 @@ def build_ast(parse_tree):
     Build Confuc-IO AST from Lark parse tree
     
     Args:
-        parse_tree: Lark Tree object from parser
+        parse_tree: Lark Tree object from parser, or Confuc-IO source text,
+            which is handed to parse_ast() and never becomes a Tree
         
     Returns:
         Program AST node
     """
-    builder = ConfucIOASTBuilder()
+    if isinstance(parse_tree, str):
+        return parse_ast(parse_tree)
+    
+    try:
+        return _BUILDER.transform(parse_tree)
+    except VisitError as e:
+        # Transformer.transform wraps any exception raised by a rule method
+        raise ASTBuilderError(f"Failed to build AST: {e}") from e
+
+
+# Parser with the builder embedded, created on first use of parse_ast()
+_ast_parser = None
+
+
+def parse_ast(source_code: str):
+    """
+    Parse Confuc-IO source code straight into an AST
+    
+    The builder runs as the parser's semantic actions, so no intermediate
+    parse tree is materialized and there is no second traversal. Use
+    ConfucIOParser + build_ast instead when the parse tree itself is needed.
+    
+    Args:
+        source_code: Confuc-IO source text
+        
+    Returns:
+        Program AST node, read-only: it shares its small Literal nodes with
+        every other AST in the process
+    """
+    global _ast_parser
+    if _ast_parser is None:
+        from confucio_parser import ConfucIOParser
+        # Not memoized: the disk cache covers reuse and a memo pins whole
+        # trees in memory. The AST is read-only regardless (shared literals)
+        _ast_parser = ConfucIOParser(transformer=_BUILDER, cache_size=0)
+    
     try:
-        ast = builder.transform(parse_tree)
-        return ast
-    except Exception as e:
+        return _ast_parser.parse(source_code)
+    except (ValueError, TypeError, AttributeError) as e:
+        # Embedded rule methods are called directly by the parser, so their
+        # exceptions arrive unwrapped; Lark's own errors propagate unchanged
         raise ASTBuilderError(f"Failed to build AST: {e}") from e
 
 
@@ -465,7 +289,8 @@ if __name__ == '__main__':
     print(parse_tree.pretty())
     print("\n" + "="*60 + "\n")
     
-    ast = build_ast(parse_tree)
+    # Built straight from the source; the tree above is only for display
+    ast = build_ast(test_code)
     
     print("Built AST:")
     print(f"Program with {len(ast.functions)} function(s)")
@@ -0,0 +1,177 @@
+"""
+Confuc-IO Compilation Cache
+
+Persists the Lark parse tree and built AST on disk, keyed by a SHA256 hash of
+the source code together with everything that can change the front-end output
+(grammar, AST/builder modules, Lark version). Unchanged inputs skip both
+parsing and AST construction on later CLI invocations.
+
+Also persists the object code the JIT compiles, keyed by a hash of the LLVM IR
+together with the code generator (pass pipeline, target machine options) and
+the LLVM build, so running an unchanged program skips IR parsing, verification
+and codegen.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+from pathlib import Path
+
+
+# Bump when the on-disk layout of cache entries changes
+CACHE_FORMAT_VERSION = 1
+
+_SRC_DIR = Path(__file__).parent
+_GRAMMAR_FILE = _SRC_DIR.parent / 'grammar' / 'confucio.lark'
+
+# Files whose contents affect the cached parse tree / AST
+_FRONTEND_FILES = (
+    _GRAMMAR_FILE,
+    _SRC_DIR / 'confucio_ast.py',
+    _SRC_DIR / 'confucio_ast_builder.py',
+    _SRC_DIR / 'confucio_parser.py',   # Lark options shape the parse tree
+)
+
+# Files whose contents affect the cached object code besides the IR itself
+_BACKEND_FILES = (
+    _SRC_DIR / 'confucio_codegen.py',  # pre-JIT pass pipeline, target machine options
+)
+
+
+def default_cache_dir() -> Path:
+    """Return the cache directory (honours $XDG_CACHE_HOME)"""
+    base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'confucio'
+
+
+def _frontend_fingerprint() -> bytes:
+    """Hash of the compiler front-end, so code changes invalidate old entries"""
+    import lark
+    
+    h = hashlib.sha256()
+    h.update(f"{CACHE_FORMAT_VERSION}:{lark.__version__}".encode())
+    for path in _FRONTEND_FILES:
+        h.update(path.read_bytes())
+    return h.digest()
+
+
+class CompilationCache:
+    """On-disk cache of (parse_tree, ast) pairs keyed by source hash"""
+
+    def __init__(self, cache_dir: Path = None):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+        self._fingerprint = _frontend_fingerprint()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, source: bytes) -> str:
+        """Compute the cache key for a source file's contents"""
+        return hashlib.sha256(self._fingerprint + source).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.ast.pkl"
+
+    def load(self, key: str):
+        """
+        Load a cached entry
+
+        Returns:
+            (parse_tree, ast) tuple, or None on a miss or unreadable entry.
+            parse_tree is None if the entry was stored without one.
+        """
+        try:
+            with open(self._entry_path(key), 'rb') as f:
+                entry = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry
+
+    def store(self, key: str, parse_tree, ast):
+        """Store an entry; failures are ignored since the cache is best-effort"""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Write to a temp file and rename so readers never see partial entries
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        except OSError:
+            return
+
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump((parse_tree, ast), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._entry_path(key))
+        except (OSError, pickle.PicklingError):
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
+def _backend_fingerprint() -> bytes:
+    """Hash of the code generator, LLVM build and host, whose object code is not portable"""
+    import llvmlite
+    from llvmlite import binding as llvm_binding
+    
+    h = hashlib.sha256()
+    h.update(f"{CACHE_FORMAT_VERSION}:{llvmlite.__version__}:{llvm_binding.llvm_version_info}:".encode())
+    h.update(f"{llvm_binding.get_default_triple()}:{llvm_binding.get_host_cpu_name()}:".encode())
+    try:
+        h.update(llvm_binding.get_host_cpu_features().flatten().encode())
+    except RuntimeError:
+        pass
+    for path in _BACKEND_FILES:
+        h.update(path.read_bytes())
+    return h.digest()
+
+
+class ObjectCache:
+    """On-disk cache of JIT object code keyed by IR hash"""
+
+    def __init__(self, cache_dir: Path = None):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else default_cache_dir() / 'obj'
+        self._fingerprint = _backend_fingerprint()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, llvm_ir: str, *settings) -> str:
+        """Compute the cache key for IR compiled with the given settings"""
+        h = hashlib.sha256(self._fingerprint)
+        h.update(repr(settings).encode())
+        h.update(llvm_ir.encode('utf-8'))
+        return h.hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.o"
+
+    def load(self, key: str):
+        """Return the cached object bytes, or None on a miss"""
+        try:
+            data = self._entry_path(key).read_bytes()
+        except OSError:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return data
+
+    def store(self, key: str, data: bytes):
+        """Store object bytes; failures are ignored since the cache is best-effort"""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Write to a temp file and rename so readers never see partial entries
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        except OSError:
+            return
+
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self._entry_path(key))
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
@@ -9,7 +9,13 @@ by a visit_<ClassName> method, dispatched via getattr.
 from llvmlite import ir, binding as llvm_binding
 import ctypes
 import ctypes.util
-from confucio_ast import *
+import sys
+from typing import List
+from confucio_ast import (
+    Program, FunctionDef, Statement, VarDeclaration, Assignment, IfStatement,
+    WhileLoop, ForLoop, ReturnStatement, PrintStatement, InputStatement,
+    ExpressionStatement, Literal, Identifier, BinaryOp, FunctionCall,
+)
 from confucio_mappings import (
     KEYWORD_MAPPINGS,
     TYPE_MAPPINGS,
@@ -19,9 +25,41 @@ from confucio_mappings import (
 )
 
 
+_LLVM_INITIALIZED = False
+
+
+def _initialize_llvm():
+    """Initialize LLVM's targets and asm printers, once per process"""
+    global _LLVM_INITIALIZED
+    if _LLVM_INITIALIZED:
+        return
+    # The native target is what the JIT, emit_object() and the host
+    # target machine need; the others allow other triples
+    llvm_binding.initialize_native_target()
+    llvm_binding.initialize_native_asmprinter()
+    llvm_binding.initialize_all_targets()
+    llvm_binding.initialize_all_asmprinters()
+    _LLVM_INITIALIZED = True
+
+
 # Initialize LLVM targets for JIT execution
-llvm_binding.initialize_all_targets()
-llvm_binding.initialize_all_asmprinters()
+_initialize_llvm()
+
+# Host triple and CPU; JIT'd and optimized code is tuned for (and may use the
+# extensions of) the machine we are running on
+HOST_TRIPLE = llvm_binding.get_default_triple()
+HOST_CPU = llvm_binding.get_host_cpu_name()
+try:
+    HOST_FEATURES = llvm_binding.get_host_cpu_features().flatten()
+except RuntimeError:
+    # Feature detection is not supported on every host
+    HOST_FEATURES = ''
+
+
+# Expression nodes whose value is a compile-time constant when it is an
+# ir.Constant (literals, and operators on them that were folded); built once
+# rather than as a tuple on every visit_BinaryOp
+_CONSTANT_EXPR_NODES = (Literal, BinaryOp)
 
 
 class CodeGenError(Exception):
@@ -29,83 +67,128 @@ class CodeGenError(Exception):
     pass
 
 
+def _memory_locals(body: List[Statement]) -> set:
+    """
+    Names in a function body that need a stack slot instead of an SSA value:
+    scanf targets, and variables declared or assigned inside a nested block
+    (whose value would otherwise need a phi at the join point)
+    """
+    names = set()
+    
+    def scan(stmts, nested):
+        for stmt in stmts:
+            if isinstance(stmt, InputStatement):
+                names.add(stmt.variable_name)
+            elif isinstance(stmt, (VarDeclaration, Assignment)):
+                if nested:
+                    names.add(stmt.name)
+            elif isinstance(stmt, IfStatement):
+                scan(stmt.then_body, True)
+                scan(stmt.else_body or (), True)
+            elif isinstance(stmt, WhileLoop):
+                scan(stmt.body, True)
+            elif isinstance(stmt, ForLoop):
+                scan((stmt.init, stmt.update), True)
+                scan(stmt.body, True)
+    
+    scan(body, False)
+    return names
+
+
 class CodeGenerator:
     """LLVM IR code generator for Confuc-IO using reflection-based visitor pattern"""
     
     def __init__(self):
-        # LLVM initialization is now automatic in newer llvmlite versions
-        
         # Create module
         self.module = ir.Module(name="confucio_module")
         
         # Set target triple to host machine (e.g., arm64-apple-darwin23.0.0)
         # This is needed for llc to compile to native code
-        try:
-            llvm.initialize_native_target()
-            llvm.initialize_native_asmprinter()
-            target = llvm.Target.from_default_triple()
-            self.module.triple = target.triple
-        except:
-            # If initialization fails, use a sensible default
-            # This will be detected as arm64 on Apple Silicon Macs
-            import platform
-            if platform.system() == 'Darwin' and platform.machine() == 'arm64':
-                self.module.triple = "arm64-apple-darwin"
-            elif platform.system() == 'Darwin':
-                self.module.triple = "x86_64-apple-darwin"
-            elif platform.system() == 'Linux':
-                self.module.triple = "x86_64-unknown-linux-gnu"
-            # else keep default
+        self.module.triple = HOST_TRIPLE
         
         self.builder = None
         self.current_function = None
         
-        # Symbol table for LLVM values
+        # AST node class → bound visit_<ClassName> method, filled on first use
+        self._visitors = {}
+        
+        # Symbol table for LLVM values: stack slots, and the current value of
+        # locals that never need one (see _memory_locals)
         self.variables = {}
+        self.ssa_vals = {}
+        self._memory_names = set()
         self.functions = {}
         self.main_function_name = MAIN_FUNCTION_NAME
         
+        # LLVM types and constants used throughout code generation, built once
+        self.i1 = ir.IntType(1)
+        self.i8 = ir.IntType(8)
+        self.i8p = self.i8.as_pointer()
+        self.i32 = ir.IntType(32)
+        self.i64 = ir.IntType(64)
+        self.f64 = ir.DoubleType()
+        self.i32_zero = ir.Constant(self.i32, 0)
+        self.i64_one = ir.Constant(self.i64, 1)
+        
         # Type mappings to LLVM types
         self.type_map = {
-            'Float': ir.IntType(32),      # int in Confuc-IO → i32
-            'int': ir.IntType(8).as_pointer(),  # string in Confuc-IO → i8*
-            'String': ir.DoubleType(),    # float in Confuc-IO → double
-            'While': ir.IntType(1),       # bool in Confuc-IO → i1
+            'Float': self.i32,   # int in Confuc-IO → i32
+            'int': self.i8p,     # string in Confuc-IO → i8*
+            'String': self.f64,  # float in Confuc-IO → double
+            'While': self.i1,    # bool in Confuc-IO → i1
         }
         
-        # Declare C standard library functions
-        self._declare_stdlib()
+        # C standard library functions: (return type, argument types, varargs).
+        # Each is declared in the module only once code actually calls it
+        self._extern_signatures = {
+            'printf': (self.i32, [self.i8p], True),          # output
+            'puts': (self.i32, [self.i8p], False),           # output of plain text
+            'scanf': (self.i32, [self.i8p], True),           # input
+            'malloc': (self.i8p, [self.i64], False),         # string allocation
+            'strlen': (self.i64, [self.i8p], False),         # string length
+            'strcpy': (self.i8p, [self.i8p, self.i8p], False),  # string copy
+            'strcat': (self.i8p, [self.i8p, self.i8p], False),  # string concatenation
+            'strcmp': (self.i32, [self.i8p, self.i8p], False),  # string comparison
+        }
+        self._externs = {}
         
-        # String constants counter
+        # String constants counter, the i8* to the global emitted for each distinct string,
+        # and the [N x i8] type for each string length seen
         self.string_counter = 0
-    
-    def _declare_stdlib(self):
-        """Declare C standard library functions for I/O and string operations"""
-        void_ptr = ir.IntType(8).as_pointer()
+        self._str_cache = {}
+        self._str_types = {}
         
-        # printf(i8*, ...) - for output
-        printf_ty = ir.FunctionType(ir.IntType(32), [void_ptr], var_arg=True)
-        self.printf = ir.Function(self.module, printf_ty, name="printf")
+        # Back-end (instruction selection/scheduling) optimization level used
+        # by the JIT target machine; independent of the IR passes in optimize()
+        self.jit_opt_level = 0
         
-        # scanf(i8*, ...) - for input
-        scanf_ty = ir.FunctionType(ir.IntType(32), [void_ptr], var_arg=True)
-        self.scanf = ir.Function(self.module, scanf_ty, name="scanf")
+        # Host target and the target machine used by optimize()
+        self._target = llvm_binding.Target.from_triple(HOST_TRIPLE)
+        self._target_machine = None
         
-        # malloc(i64) - for string allocation
-        malloc_ty = ir.FunctionType(void_ptr, [ir.IntType(64)])
-        self.malloc = ir.Function(self.module, malloc_ty, name="malloc")
+        # Text and verified parse of self.module, reset whenever it changes
+        self._ir_text = None
+        self._parsed_mod = None
         
-        # strlen(i8*) - for string length
-        strlen_ty = ir.FunctionType(ir.IntType(64), [void_ptr])
-        self.strlen = ir.Function(self.module, strlen_ty, name="strlen")
+        # Result of the last optimize() (ModuleRef and its text), keyed by its
+        # settings; shared by execute() and generate_executable()
+        self._optimized_ref = None
+        self._optimized_ir = None
+        self._optimized_key = None
         
-        # strcpy(i8*, i8*) - for string copy
-        strcpy_ty = ir.FunctionType(void_ptr, [void_ptr, void_ptr])
-        self.strcpy = ir.Function(self.module, strcpy_ty, name="strcpy")
-        
-        # strcat(i8*, i8*) - for string concatenation
-        strcat_ty = ir.FunctionType(void_ptr, [void_ptr, void_ptr])
-        self.strcat = ir.Function(self.module, strcat_ty, name="strcat")
+        # Optional confucio_cache.ObjectCache for the code execute() compiles
+        self.object_cache = None
+    
+    def _get_extern(self, name: str) -> ir.Function:
+        """Return the declaration of a C library function, declaring it on first use"""
+        func = self._externs.get(name)
+        if func is None:
+            ret_type, arg_types, var_arg = self._extern_signatures[name]
+            func_ty = ir.FunctionType(ret_type, arg_types, var_arg=var_arg)
+            func = ir.Function(self.module, func_ty, name=name)
+            self._externs[name] = func
+            self._module_changed()
+        return func
     
     def get_llvm_type(self, confucio_type: str) -> ir.Type:
         """Convert Confuc-IO type to LLVM type"""
@@ -119,11 +202,17 @@ class CodeGenerator:
         
         For statement nodes, returns None.
         For expression nodes, returns an ir.Value.
+        
+        The bound method is looked up once per node class and then served
+        from self._visitors, so each visit costs a single dict lookup.
         """
-        method_name = f'visit_{type(node).__name__}'
-        visitor = getattr(self, method_name, None)
+        visitor = self._visitors.get(type(node))
         if visitor is None:
-            raise CodeGenError(f"No visitor method for AST node type: {type(node).__name__}")
+            method_name = f'visit_{type(node).__name__}'
+            visitor = getattr(self, method_name, None)
+            if visitor is None:
+                raise CodeGenError(f"No visitor method for AST node type: {type(node).__name__}")
+            self._visitors[type(node)] = visitor
         return visitor(node)
     
     def generate(self, ast: Program) -> str:
@@ -133,10 +222,26 @@ class CodeGenerator:
             self.generate_function(func)
         
         # Return IR as string
-        return str(self.module)
+        return self.get_ir()
+    
+    def get_ir(self) -> str:
+        """Return the module's IR text, serializing it only after it has changed"""
+        if self._ir_text is None:
+            self._ir_text = str(self.module)
+        return self._ir_text
+    
+    def _module_changed(self):
+        """Drop the cached IR text and parse after adding to self.module"""
+        self._ir_text = None
+        self._parsed_mod = None
+        self._optimized_ref = None
+        self._optimized_ir = None
+        self._optimized_key = None
     
     def generate_function(self, func_def: FunctionDef):
         """Generate LLVM IR for a function definition"""
+        self._module_changed()
+        
         # Convert parameter types to LLVM types
         param_types = []
         for param in func_def.parameters:
@@ -163,9 +268,16 @@ class CodeGenerator:
         self.current_function = function
         
         self.variables = {} # Clear for new function scope
+        self.ssa_vals = {}
+        self._memory_names = _memory_locals(func_def.body)
         
-        # Create allocas for parameters and store argument values
+        # Create allocas for parameters and store argument values; parameters
+        # that are never reassigned in a nested block use the argument directly
         for i, param in enumerate(func_def.parameters):
+            if param.name not in self._memory_names:
+                function.args[i].name = param.name
+                self.ssa_vals[param.name] = function.args[i]
+                continue
             param_type = self.get_llvm_type(param.param_type)
             # Allocate space for parameter
             param_ptr = self.builder.alloca(param_type, name=param.name)
@@ -175,14 +287,11 @@ class CodeGenerator:
             self.variables[param.name] = param_ptr
         
         # Generate function body
-        has_return = False
         for stmt in func_def.body:
-            if isinstance(stmt, ReturnStatement):
-                has_return = True
             self.visit(stmt)
         
-        # Add default return if none exists
-        if not has_return:
+        # Add default return if control can fall off the end
+        if not self.builder.block.is_terminated:
             if isinstance(return_type, ir.IntType):
                 self.builder.ret(ir.Constant(return_type, 0))
             elif isinstance(return_type, ir.DoubleType):
@@ -196,6 +305,12 @@ class CodeGenerator:
         """Visit variable declaration"""
         var_type = self.get_llvm_type(decl.var_type)
         
+        # Locals only written in straight-line code at function level are kept
+        # as SSA values, skipping the alloca/store/load round trip
+        if decl.initializer and decl.name not in self._memory_names:
+            self.ssa_vals[decl.name] = self.visit(decl.initializer)
+            return
+        
         # Allocate space for variable
         var_alloca = self.builder.alloca(var_type, name=decl.name)
         self.variables[decl.name] = var_alloca
@@ -208,13 +323,16 @@ class CodeGenerator:
     def visit_Assignment(self, assign: Assignment):
         """Visit assignment statement"""
         value = self.visit(assign.value)
+        if assign.name in self.ssa_vals:
+            self.ssa_vals[assign.name] = value
+            return
         var_ptr = self.variables[assign.name]
         self.builder.store(value, var_ptr)
     
     def visit_IfStatement(self, if_stmt: IfStatement):
         """Visit if statement (func keyword translates to if)"""
         # Generate condition
-        condition = self.visit(if_stmt.condition)
+        condition = self._to_i1(self.visit(if_stmt.condition))
         
         # Create blocks
         then_block = self.current_function.append_basic_block(name="if.then")
@@ -254,14 +372,7 @@ class CodeGenerator:
         
         # Generate condition block
         self.builder.position_at_end(cond_block)
-        condition = self.visit(while_stmt.condition)
-        
-        # Ensure condition is i1 (boolean)
-        # If it's an integer, compare with 0 (non-zero = true)
-        if condition.type == ir.IntType(32):
-            zero = ir.Constant(ir.IntType(32), 0)
-            condition = self.builder.icmp_signed('!=', condition, zero, name="tobool")
-        
+        condition = self._to_i1(self.visit(while_stmt.condition))
         self.builder.cbranch(condition, body_block, end_block)
         
         # Generate body block
@@ -291,7 +402,7 @@ class CodeGenerator:
         
         # Generate condition block
         self.builder.position_at_end(cond_block)
-        condition = self.visit(for_stmt.condition)
+        condition = self._to_i1(self.visit(for_stmt.condition))
         self.builder.cbranch(condition, body_block, end_block)
         
         # Generate body block
@@ -309,6 +420,16 @@ class CodeGenerator:
         # Continue at end block
         self.builder.position_at_end(end_block)
     
+    def _to_i1(self, value: ir.Value) -> ir.Value:
+        """Coerce a condition to i1 (non-zero = true); comparisons pass through"""
+        if value.type == self.i1:
+            return value
+        if isinstance(value.type, ir.IntType):
+            return self.builder.icmp_signed('!=', value, ir.Constant(value.type, 0), name="tobool")
+        if isinstance(value.type, ir.DoubleType):
+            return self.builder.fcmp_unordered('!=', value, ir.Constant(value.type, 0.0), name="tobool")
+        raise CodeGenError(f"Cannot use value of type {value.type} as a condition")
+    
     def visit_ReturnStatement(self, ret_stmt: ReturnStatement):
         """Visit return statement (* translates to return)"""
         if ret_stmt.value:
@@ -319,23 +440,30 @@ class CodeGenerator:
     
     def visit_PrintStatement(self, stmt: PrintStatement):
         """Visit print statement (FileInputStream function)"""
-        from confucio_mappings import FORMAT_STRING_MAPPINGS
+        # Only string literals (or nothing): plain text, and puts adds the newline
+        if all(isinstance(expr, Literal) and expr.literal_type == 'string' for expr in stmt.expressions):
+            text = "".join(expr.value for expr in stmt.expressions)
+            self.builder.call(self._get_extern('puts'), [self._get_string_constant(text)])
+            return
         
+        # Build one format string for the whole statement and call printf once
+        fmt_parts = []
+        args = []
         for expr in stmt.expressions:
             # Check if this is a string literal at the AST level
             if isinstance(expr, Literal) and expr.literal_type == 'string':
-                # String literal - print it directly (it's just text, not formatted data)
-                str_const = self._get_string_constant(expr.value)
-                self.builder.call(self.printf, [str_const])
+                # String literal - inline it as text (it's not formatted data)
+                fmt_parts.append(expr.value.replace('%', '%%'))
             else:
-                # Other expression types - generate value and print with appropriate format
-                value = self.visit(expr)
-                self._print_value(value, FORMAT_STRING_MAPPINGS)
-        
-        # Print newline after all values (use actual newline character, not escaped)
-        newline_str = self._get_string_constant("\n")
-        self.builder.call(self.printf, [newline_str])
-
+                # Other expression types - generate value and add its format
+                spec, value = self._print_format(self.visit(expr))
+                fmt_parts.append(spec)
+                args.append(value)
+        
+        # End with a newline (use actual newline character, not escaped)
+        fmt_parts.append("\n")
+        fmt_ptr = self._get_string_constant("".join(fmt_parts))
+        self.builder.call(self._get_extern('printf'), [fmt_ptr] + args)
     
     def visit_InputStatement(self, stmt: InputStatement):
         """Visit input statement (deleteSystem32 function)"""
@@ -344,70 +472,77 @@ class CodeGenerator:
         
         # Determine format string based on type
         # NOTE: scanf must use REAL printf format specifiers, not confusing ones!
-        if var_type == ir.IntType(32):  # Float type (actually int)
+        if var_type == self.i32:  # Float type (actually int)
             fmt = '%d'  # Real scanf format for int
-        elif var_type == ir.DoubleType():  # String type (actually float)
+        elif var_type == self.f64:  # String type (actually float)
             fmt = '%lf'  # Real scanf format for double
         elif isinstance(var_type, ir.PointerType):  # int type (actually string)
             # For string input, allocate buffer
-            size_const = ir.Constant(ir.IntType(64), 256)
-            buf = self.builder.call(self.malloc, [size_const])
+            size_const = ir.Constant(self.i64, 256)
+            buf = self.builder.call(self._get_extern('malloc'), [size_const])
             
             # Limit input to 255 chars
             fmt_ptr = self._get_string_constant('%255s')
-            self.builder.call(self.scanf, [fmt_ptr, buf])
+            self.builder.call(self._get_extern('scanf'), [fmt_ptr, buf])
             self.builder.store(buf, var_ptr)
             return
-        elif var_type == ir.IntType(1):  # While type (actually bool)
+        elif var_type == self.i1:  # While type (actually bool)
             fmt = '%d'  # Real scanf format for bool (as int)
         else:
             fmt = '%d'  # Default
         
         fmt_ptr = self._get_string_constant(fmt)
-        self.builder.call(self.scanf, [fmt_ptr, var_ptr])
+        self.builder.call(self._get_extern('scanf'), [fmt_ptr, var_ptr])
     
-    def _print_value(self, val: ir.Value, fmt_mappings: dict):
-        """Helper to print a value with appropriate format string"""
+    def _print_format(self, val: ir.Value):
+        """Return (printf conversion, argument) for printing a value"""
         # NOTE: We use REAL printf format strings here, not the "confusing" ones
         # The confusing format strings are just for Confuc-IO syntax/documentation
-        if val.type == ir.IntType(32):  # Float type (actually int)
-            fmt_ptr = self._get_string_constant('%d')  # Use real printf format for int
-            self.builder.call(self.printf, [fmt_ptr, val])
-        elif val.type == ir.DoubleType():  # String type (actually float)
-            fmt_ptr = self._get_string_constant('%f')  # Use real printf format for float
-            self.builder.call(self.printf, [fmt_ptr, val])
-        elif val.type == ir.IntType(1):  # While type (actually bool)
+        if val.type == self.i32:  # Float type (actually int)
+            return '%d', val  # Use real printf format for int
+        elif val.type == self.f64:  # String type (actually float)
+            return '%f', val  # Use real printf format for float
+        elif val.type == self.i1:  # While type (actually bool)
             # Extend bool to i32 for printing
-            val_ext = self.builder.zext(val, ir.IntType(32))
-            fmt_ptr = self._get_string_constant('%d')  # Use real printf format
-            self.builder.call(self.printf, [fmt_ptr, val_ext])
+            return '%d', self.builder.zext(val, self.i32)
         elif isinstance(val.type, ir.PointerType):  # int type (actually string variable)
             # String variable - use real printf format for strings
-            fmt_ptr = self._get_string_constant('%s')
-            self.builder.call(self.printf, [fmt_ptr, val])
+            return '%s', val
         else:
             # Default: print as int
-            fmt_ptr = self._get_string_constant('%d')
-            self.builder.call(self.printf, [fmt_ptr, val])
+            return '%d', val
     
     def _get_string_constant(self, s: str) -> ir.Value:
-        """Create a global string constant and return pointer to it"""
-        # Convert string to bytes with null terminator
-        b = bytearray(s.encode("utf8"))
-        b.append(0)
-        c = ir.Constant(ir.ArrayType(ir.IntType(8), len(b)), b)
-        
-        # Create unique global variable name
-        name = f"str_{self.string_counter}"
-        self.string_counter += 1
-        
-        # Create global variable
-        gvar = ir.GlobalVariable(self.module, c.type, name=name)
-        gvar.global_constant = True
-        gvar.initializer = c
-        
-        # Return pointer to first element
-        return self.builder.bitcast(gvar, ir.IntType(8).as_pointer())
+        """Return an i8* to a global string constant, emitting each distinct string once"""
+        ptr = self._str_cache.get(s)
+        if ptr is None:
+            # Convert string to bytes with null terminator
+            b = bytearray(s.encode("utf8"))
+            b.append(0)
+            str_type = self._str_types.get(len(b))
+            if str_type is None:
+                str_type = self._str_types[len(b)] = ir.ArrayType(self.i8, len(b))
+            c = ir.Constant(str_type, b)
+            
+            # Create unique global variable name
+            name = f"str_{self.string_counter}"
+            self.string_counter += 1
+            
+            # Create global variable; private + unnamed_addr lets LLVM merge it
+            # with identical constants
+            gvar = ir.GlobalVariable(self.module, c.type, name=name)
+            gvar.global_constant = True
+            gvar.linkage = 'private'
+            gvar.unnamed_addr = True
+            gvar.initializer = c
+            
+            # Pointer to the first element as a constant expression, so uses
+            # need no bitcast instruction
+            ptr = gvar.bitcast(self.i8p)
+            self._str_cache[s] = ptr
+            self._module_changed()
+        
+        return ptr
 
 
     def visit_ExpressionStatement(self, stmt: ExpressionStatement):
@@ -419,11 +554,11 @@ class CodeGenerator:
     def visit_Literal(self, lit: Literal) -> ir.Value:
         """Visit literal value"""
         if lit.literal_type == 'int':
-            return ir.Constant(ir.IntType(32), int(lit.value))
+            return ir.Constant(self.i32, int(lit.value))
         elif lit.literal_type == 'float':
-            return ir.Constant(ir.DoubleType(), float(lit.value))
+            return ir.Constant(self.f64, float(lit.value))
         elif lit.literal_type == 'bool':
-            return ir.Constant(ir.IntType(1), int(lit.value))
+            return ir.Constant(self.i1, int(lit.value))
         elif lit.literal_type == 'string':
             # String literals are stored as global constants
             return self._get_string_constant(lit.value)
@@ -431,7 +566,10 @@ class CodeGenerator:
             raise CodeGenError(f"Unsupported literal type: {lit.literal_type}")
     
     def visit_Identifier(self, ident: Identifier) -> ir.Value:
-        """Visit identifier reference (load from memory)"""
+        """Visit identifier reference (SSA value, or load from memory)"""
+        value = self.ssa_vals.get(ident.name)
+        if value is not None:
+            return value
         var_ptr = self.variables[ident.name]
         return self.builder.load(var_ptr, name=ident.name)
     
@@ -447,6 +585,14 @@ class CodeGenerator:
         confucio_op = binop.operator
         conventional_op = OPERATOR_MAPPINGS.get(confucio_op, confucio_op)
         
+        # Fold arithmetic on literals (possibly already folded) at construction
+        left_literal = isinstance(binop.left, _CONSTANT_EXPR_NODES) and isinstance(left, ir.Constant)
+        right_literal = isinstance(binop.right, _CONSTANT_EXPR_NODES) and isinstance(right, ir.Constant)
+        if left_literal and right_literal:
+            folded = self._fold_constant(conventional_op, left, right)
+            if folded is not None:
+                return folded
+        
         # Special case: String concatenation with + operator
         if conventional_op == '+':
             # Check if operands are strings (i8*)
@@ -459,8 +605,18 @@ class CodeGenerator:
         elif conventional_op == '-':
             return self.builder.sub(left, right, name="subtmp")
         elif conventional_op == '*':
+            # Multiplying by a literal power of two is a shift
+            k = self._log2(right) if right_literal else None
+            if k is not None:
+                return self.builder.shl(left, ir.Constant(self.i32, k), name="multmp")
+            k = self._log2(left) if left_literal else None
+            if k is not None:
+                return self.builder.shl(right, ir.Constant(self.i32, k), name="multmp")
             return self.builder.mul(left, right, name="multmp")
         elif conventional_op == '/':
+            k = self._log2(right) if right_literal else None
+            if k is not None:
+                return self._sdiv_pow2(left, k)
             return self.builder.sdiv(left, right, name="divtmp")
         elif conventional_op == '>':
             return self.builder.icmp_signed('>', left, right, name="gttmp")
@@ -475,42 +631,80 @@ class CodeGenerator:
         else:
             raise CodeGenError(f"Unsupported operator: {conventional_op}")
     
+    def _fold_constant(self, op: str, left: ir.Constant, right: ir.Constant):
+        """Evaluate an i32 operation on constants, or return None if it can't be folded"""
+        if left.type != self.i32 or right.type != self.i32:
+            return None
+        a, b = left.constant, right.constant
+        if op == '+':
+            result = a + b
+        elif op == '-':
+            result = a - b
+        elif op == '*':
+            result = a * b
+        elif op == '/':
+            if b == 0 or (a == -2**31 and b == -1):
+                return None  # undefined behaviour; leave it to run time
+            # sdiv truncates toward zero
+            result = abs(a) // abs(b) * (1 if (a < 0) == (b < 0) else -1)
+        elif op == '>':
+            return ir.Constant(self.i1, int(a > b))
+        elif op == '<':
+            return ir.Constant(self.i1, int(a < b))
+        elif op == '==':
+            return ir.Constant(self.i1, int(a == b))
+        else:
+            return None
+        # Wrap to i32 like the hardware would
+        result &= 0xFFFFFFFF
+        if result & 0x80000000:
+            result -= 0x100000000
+        return ir.Constant(self.i32, result)
+    
+    def _log2(self, value: ir.Constant):
+        """Return k if value is the i32 constant 2**k (k >= 1), else None"""
+        if value.type != self.i32:
+            return None
+        n = value.constant
+        if n > 1 and n & (n - 1) == 0:
+            return n.bit_length() - 1
+        return None
+    
+    def _sdiv_pow2(self, x: ir.Value, k: int) -> ir.Value:
+        """Signed x / 2**k without sdiv: bias negative x by 2**k - 1, then shift"""
+        sign = self.builder.ashr(x, ir.Constant(self.i32, 31))
+        bias = self.builder.lshr(sign, ir.Constant(self.i32, 32 - k))
+        biased = self.builder.add(x, bias)
+        return self.builder.ashr(biased, ir.Constant(self.i32, k), name="divtmp")
+    
     def _concatenate_strings(self, left: ir.Value, right: ir.Value) -> ir.Value:
         """Concatenate two strings using C stdlib functions"""
         # Get length of both strings
-        len_left = self.builder.call(self.strlen, [left])
-        len_right = self.builder.call(self.strlen, [right])
+        len_left = self.builder.call(self._get_extern('strlen'), [left])
+        len_right = self.builder.call(self._get_extern('strlen'), [right])
         
         # Calculate total length (left + right + 1 for null terminator)
         total_len = self.builder.add(len_left, len_right, name="total_len")
-        one = ir.Constant(ir.IntType(64), 1)
-        total_len_with_null = self.builder.add(total_len, one, name="total_len_null")
+        total_len_with_null = self.builder.add(total_len, self.i64_one, name="total_len_null")
         
         # Allocate memory for result
-        result_ptr = self.builder.call(self.malloc, [total_len_with_null])
+        result_ptr = self.builder.call(self._get_extern('malloc'), [total_len_with_null])
         
         # Copy first string
-        self.builder.call(self.strcpy, [result_ptr, left])
+        self.builder.call(self._get_extern('strcpy'), [result_ptr, left])
         
         # Concatenate second string
-        self.builder.call(self.strcat, [result_ptr, right])
+        self.builder.call(self._get_extern('strcat'), [result_ptr, right])
         
         return result_ptr
     
     def _compare_strings(self, left: ir.Value, right: ir.Value) -> ir.Value:
         """Compare two strings using strcmp (returns 0 if equal)"""
-        # Declare strcmp if not already declared
-        if not hasattr(self, 'strcmp'):
-            void_ptr = ir.IntType(8).as_pointer()
-            strcmp_ty = ir.FunctionType(ir.IntType(32), [void_ptr, void_ptr])
-            self.strcmp = ir.Function(self.module, strcmp_ty, name="strcmp")
-        
         # Call strcmp
-        cmp_result = self.builder.call(self.strcmp, [left, right])
+        cmp_result = self.builder.call(self._get_extern('strcmp'), [left, right])
         
         # strcmp returns 0 if equal, so compare result with 0
-        zero = ir.Constant(ir.IntType(32), 0)
-        return self.builder.icmp_signed('==', cmp_result, zero, name="streqtmp")
+        return self.builder.icmp_signed('==', cmp_result, self.i32_zero, name="streqtmp")
     
     def visit_FunctionCall(self, call: FunctionCall) -> ir.Value:
         """Visit function call"""
@@ -524,51 +718,207 @@ class CodeGenerator:
         # Call function
         return self.builder.call(func, args, name="calltmp")
     
-    def optimize(self, level: int = 2) -> str:
+    def _get_target_machine(self):
+        """Return the host target machine used for IR optimization, created once"""
+        if self._target_machine is None:
+            self._target_machine = self._target.create_target_machine(
+                cpu=HOST_CPU, features=HOST_FEATURES
+            )
+        return self._target_machine
+    
+    def _parse_module(self):
+        """
+        Parse and verify the generated IR, returning a ModuleRef the caller owns
+        
+        The verified module is kept until the IR changes; callers get a clone
+        (which they may optimize or hand to the JIT), so repeated optimize() and
+        execute() calls on an unchanged module skip parsing and verification.
+        """
+        if self._parsed_mod is None:
+            mod = llvm_binding.parse_assembly(self.get_ir())
+            mod.verify()
+            self._parsed_mod = mod
+        return self._parsed_mod.clone()
+    
+    def optimize(self, level: int = 2, loop_vectorize: bool = None,
+                 slp_vectorize: bool = None, loop_unroll: bool = True) -> str:
         """
         Optimize the generated LLVM IR
         
         Args:
             level: Optimization level (0-3)
+            loop_vectorize: Enable the loop vectorizer (default: level >= 2)
+            slp_vectorize: Enable the SLP vectorizer (default: level >= 2)
+            loop_unroll: Allow loop unrolling (disable where it only grows code)
         
         Returns:
             Optimized LLVM IR as string
-        """
-        # Parse the IR
-        llvm_ir = str(self.module)
-        mod = llvm_binding.parse_assembly(llvm_ir)
-        mod.verify()
         
-        # Create pass manager builder
-        pmb = llvm_binding.create_pass_manager_builder()
-        pmb.opt_level = level
+        The optimized module is kept (until the IR changes) and reused by
+        execute() and generate_executable(), so all three see identical code
+        and the pipeline runs once per setting.
+        """
+        if loop_vectorize is None:
+            loop_vectorize = level >= 2
+        if slp_vectorize is None:
+            slp_vectorize = level >= 2
+        key = (level, loop_vectorize, slp_vectorize, loop_unroll)
+        if self._optimized_key == key:
+            return self._optimized_ir
         
-        # Create module pass manager
-        pm = llvm_binding.create_module_pass_manager()
-        pmb.populate(pm)
+        # Parse the IR
+        mod = self._parse_module()
+        
+        # Tune the standard -O<level> pipelines of the new pass manager
+        target_machine = self._get_target_machine()
+        pto = llvm_binding.create_pipeline_tuning_options(speed_level=level)
+        if level >= 2:
+            pto.inlining_threshold = 225
+        pto.loop_vectorization = loop_vectorize
+        pto.slp_vectorization = slp_vectorize
+        pto.loop_unrolling = loop_unroll
+        pb = llvm_binding.create_pass_builder(target_machine, pto)
+        
+        # Clean up each function first (SROA/mem2reg, instcombine, simplifycfg),
+        # turning our alloca/load/store IR into SSA before the module pipeline's
+        # inliner and IPO passes look at it
+        fpm = pb.getFunctionPassManager()
+        for func in mod.functions:
+            if not func.is_declaration:
+                fpm.run(func, pb)
         
         # Run optimization
-        pm.run(mod)
+        pm = pb.getModulePassManager()
+        pm.run(mod, pb)
         
-        return str(mod)
+        self._optimized_ref = mod
+        self._optimized_ir = str(mod)
+        self._optimized_key = key
+        return self._optimized_ir
+    
+    def _normalize_ir(self, mod, target_machine):
+        """
+        Shrink the module with a size-oriented pipeline before JIT compilation
+        
+        Runs independently of the -O flag. The naive alloca/load/store IR we
+        emit is several times larger than necessary; SROA, instcombine,
+        simplifycfg, GVN and DCE cheaply reduce it (much like an -Oz pass) and
+        leave the back end's instruction selector and register allocator less
+        work, whether the object is emitted for LLJIT or MCJIT compiles it.
+        The back-end level from set_jit_opt_level() still applies afterwards.
+        """
+        pto = llvm_binding.create_pipeline_tuning_options(speed_level=0)
+        pb = llvm_binding.create_pass_builder(target_machine, pto)
+        pm = llvm_binding.create_new_module_pass_manager()
+        pm.add_sroa_pass()
+        pm.add_instruction_combine_pass()
+        pm.add_simplify_cfg_pass()
+        pm.add_new_gvn_pass()
+        pm.add_dead_code_elimination_pass()
+        pm.run(mod, pb)
+    
+    def set_jit_opt_level(self, level: int):
+        """
+        Set the JIT code generation optimization level
+        
+        Args:
+            level: 0-3, mapping to LLVM CodeGenOpt None/Less/Default/Aggressive
+        """
+        if not 0 <= level <= 3:
+            raise CodeGenError(f"Invalid JIT optimization level: {level}")
+        self.jit_opt_level = level
     
     def execute(self) -> int:
         """
-        Execute the compiled program using JIT (MCJIT)
+        Execute the compiled program using JIT (LLJIT/ORC, or MCJIT on
+        llvmlite versions without it)
         
         Returns:
             Exit code from main() function
         """
-        # Parse LLVM IR
-        llvm_ir = str(self.module)
-        mod = llvm_binding.parse_assembly(llvm_ir)
-        mod.verify()
+        # LLJIT links object code, which may come from the object cache
+        if hasattr(llvm_binding, 'create_lljit_compiler'):
+            main_ptr, jit = self._jit_with_lljit(self._jit_object())
+        else:
+            main_ptr, jit = self._jit_with_mcjit(*self._jit_module())
+        if main_ptr == 0:
+            raise CodeGenError("Could not find main() function")
+        
+        # Create C function type and call it; jit keeps the code alive
+        cfunc = ctypes.CFUNCTYPE(ctypes.c_int)(main_ptr)
+        sys.stdout.flush()
+        result = cfunc()
+        
+        # Flush C stdio so the program's output is not reordered with ours
+        # (matters when several programs run in one process, e.g. --batch)
+        ctypes.CDLL(None).fflush(None)
+        
+        return result
+    
+    def _jit_module(self):
+        """
+        Return (module, target machine) for the JIT to compile
+        
+        The target machine uses the back-end CodeGenOpt level from
+        set_jit_opt_level(). On the LLJIT path it only emits the object code
+        that is linked; it is not cached because the MCJIT fallback takes
+        ownership of it. The module is the one optimize() produced if there
+        is one (cloned, as MCJIT takes ownership of it); otherwise the raw
+        IR, shrunk.
+        """
+        target_machine = self._target.create_target_machine(
+            cpu=HOST_CPU, features=HOST_FEATURES,
+            opt=self.jit_opt_level, codemodel='jitdefault'
+        )
+        if self._optimized_ref is not None:
+            mod = self._optimized_ref.clone()
+        else:
+            mod = self._parse_module()
+            self._normalize_ir(mod, target_machine)
+        return mod, target_machine
+    
+    def _jit_object(self) -> bytes:
+        """Return the module's object code for the JIT, via the object cache if set"""
+        if self.object_cache is None:
+            mod, target_machine = self._jit_module()
+            return target_machine.emit_object(mod)
+        
+        optimized = self._optimized_ref is not None
+        llvm_ir = self._optimized_ir if optimized else self.get_ir()
+        key = self.object_cache.key(llvm_ir, self.jit_opt_level, optimized)
+        obj = self.object_cache.load(key)
+        if obj is None:
+            mod, target_machine = self._jit_module()
+            obj = target_machine.emit_object(mod)
+            self.object_cache.store(key, obj)
+        return obj
+    
+    def _jit_with_lljit(self, obj: bytes):
+        """
+        Link an object into a fresh LLJIT instance
         
-        # Create target machine
-        target = llvm_binding.Target.from_default_triple()
-        target_machine = target.create_target_machine()
+        Returns:
+            (address of main, objects that must stay alive while it runs)
+        """
+        lljit = llvm_binding.create_lljit_compiler()
+        try:
+            # C stdlib symbols resolve against the current process
+            tracker = (llvm_binding.JITLibraryBuilder()
+                       .add_object_img(obj)
+                       .add_current_process()
+                       .export_symbol('main')
+                       .link(lljit, 'confucio'))
+        except RuntimeError as e:
+            raise CodeGenError(f"JIT linking failed: {e}")
+        return tracker['main'], (lljit, tracker)
+    
+    def _jit_with_mcjit(self, mod, target_machine):
+        """
+        Add mod to an MCJIT execution engine
         
-        # Create execution engine (MCJIT)
+        Returns:
+            (address of main, the engine, which must stay alive while it runs)
+        """
         # MCJIT should automatically resolve C stdlib symbols via the system linker
         backing_mod = llvm_binding.parse_assembly("")
         engine = llvm_binding.create_mcjit_compiler(backing_mod, target_machine)
@@ -578,23 +928,15 @@ class CodeGenerator:
         engine.finalize_object()
         engine.run_static_constructors()
         
-        # Get main() function pointer
-        main_ptr = engine.get_function_address("main")
-        if main_ptr == 0:
-            raise CodeGenError("Could not find main() function")
-        
-        # Create C function type and call it
-        cfunc = ctypes.CFUNCTYPE(ctypes.c_int)(main_ptr)
-        result = cfunc()
-        
-        return result
-
+        return engine.get_function_address("main"), engine
     
     def generate_executable(self, output_path: str):
         """
         Generate executable from LLVM IR
         
-        Note: This requires LLVM tools (llc, clang) to be installed.
+        The object file is emitted in-process by LLVM's code generator; only
+        linking needs an external tool (clang). llc is used as a fallback if
+        in-process emission fails.
         As an alternative, users can manually run:
           1. Save LLVM IR: python3 cli.py program.cio --output-llvm
           2. Compile to object: llc -filetype=obj program.ll -o program.o
@@ -605,52 +947,30 @@ class CodeGenerator:
         import os
         import shutil
         
-        # Get LLVM IR
-        llvm_ir = str(self.module)
-        
-        # Write IR to temporary file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.ll', delete=False) as f:
-            f.write(llvm_ir)
-            ll_file = f.name
-        
-        # Find llc - try PATH first, then Homebrew location
-        llc_cmd = shutil.which('llc')
-        if not llc_cmd:
-            # Try Homebrew LLVM location on macOS
-            homebrew_llc = '/opt/homebrew/opt/llvm/bin/llc'
-            if os.path.exists(homebrew_llc):
-                llc_cmd = homebrew_llc
-            else:
-                raise CodeGenError(
-                    f"llc not found. Please install LLVM:\\n"
-                    f"  macOS: brew install llvm\\n"
-                    f"  Then add to PATH: export PATH=\"/opt/homebrew/opt/llvm/bin:$PATH\""
-                )
-        
         clang_cmd = shutil.which('clang') or 'clang'
         
+        # Step 1: Compile to an object file. Use the optimized module if
+        # optimize() ran, as execute() does
+        fd, obj_file = tempfile.mkstemp(suffix='.o')
+        os.close(fd)
+        
         try:
-            # Try to compile with llc (LLVM compiler)
-            obj_file = ll_file.replace('.ll', '.o')
-            
-            # Step 1: Compile LLVM IR to object file
-            result = subprocess.run(
-                [llc_cmd, '-filetype=obj', ll_file, '-o', obj_file],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            
-            if result.returncode != 0:
-                raise CodeGenError(
-                    f"llc compilation failed: {result.stderr}\n\n"
-                    f"Make sure LLVM is installed. On macOS: brew install llvm"
-                )
+            try:
+                mod = self._optimized_ref.clone() if self._optimized_ref is not None else self._parse_module()
+                # Position-independent, so the object links into a PIE by default.
+                # Generic CPU, so the executable also runs on other machines
+                target_machine = self._target.create_target_machine(reloc='pic')
+                with open(obj_file, 'wb') as f:
+                    f.write(target_machine.emit_object(mod))
+            except RuntimeError:
+                self._compile_object_with_llc(obj_file)
             
-            # Step 2: Link object file to executable
+            # Step 2: Link object file to executable. Only stderr is kept, for
+            # the error message
             result = subprocess.run(
                 [clang_cmd, obj_file, '-o', output_path],
-                capture_output=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
                 text=True,
                 timeout=30
             )
@@ -667,7 +987,6 @@ class CodeGenerator:
             raise CodeGenError(
                 f"Required tool not found: {e}\n\n"
                 f"To generate executables, you need:\n"
-                f"  - llc (LLVM compiler): brew install llvm\n"
                 f"  - clang (linker): xcode-select --install\n\n"
                 f"Alternatively, compile manually:\n"
                 f"  1. python3 cli.py {output_path}.cio --output-llvm\n"
@@ -675,10 +994,49 @@ class CodeGenerator:
                 f"  3. clang {output_path}.o -o {output_path}"
             )
         finally:
-            # Clean up temporary files
-            for temp_file in [ll_file, obj_file]:
-                if os.path.exists(temp_file):
-                    os.remove(temp_file)
+            # Clean up temporary file
+            try:
+                os.unlink(obj_file)
+            except FileNotFoundError:
+                pass
+    
+    def _compile_object_with_llc(self, obj_file: str):
+        """Compile the IR to obj_file with the external llc tool"""
+        import subprocess
+        import os
+        import shutil
+        
+        # Find llc - try PATH first, then Homebrew location
+        llc_cmd = shutil.which('llc')
+        if not llc_cmd:
+            # Try Homebrew LLVM location on macOS
+            homebrew_llc = '/opt/homebrew/opt/llvm/bin/llc'
+            if os.path.exists(homebrew_llc):
+                llc_cmd = homebrew_llc
+            else:
+                raise CodeGenError(
+                    f"llc not found. Please install LLVM:\\n"
+                    f"  macOS: brew install llvm\\n"
+                    f"  Then add to PATH: export PATH=\"/opt/homebrew/opt/llvm/bin:$PATH\""
+                )
+        
+        llvm_ir = self._optimized_ir if self._optimized_ref is not None else self.get_ir()
+        
+        # Feed the IR on stdin ('-') rather than through a temporary .ll file
+        result = subprocess.run(
+            [llc_cmd, '-filetype=obj', '--relocation-model=pic', '-', '-o', obj_file],
+            input=llvm_ir,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            timeout=30
+        )
+        
+        if result.returncode != 0:
+            raise CodeGenError(
+                f"llc compilation failed: {result.stderr}\n\n"
+                f"Make sure LLVM is installed. On macOS: brew install llvm"
+            )
 
 
 if __name__ == '__main__':
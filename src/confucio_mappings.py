@@ -5,36 +5,48 @@ This module contains all the mappings from conventional programming constructs
 to their Confuc-IO equivalents as specified in the proposal document.
 """
 
+import functools
+import sys
+
+
+def _interned(mapping):
+    """
+    Intern every key and value, so lookups with the interned strings the AST
+    builder produces (type names, operator symbols) match on identity
+    """
+    return {sys.intern(k): sys.intern(v) for k, v in mapping.items()}
+
+
 # Keyword Mappings: Confuc-IO → Conventional
-KEYWORD_MAPPINGS = {
+KEYWORD_MAPPINGS = _interned({
     'func': 'if',          # func → if
     'for': 'func',         # for → func (function definition)
     'return': 'while',     # return → while
     'if': 'for',           # if → for
     '*': 'return',         # * → return
-}
+})
 
 # Reverse mapping: Conventional -> Confuc-IO
 KEYWORD_REVERSE = {v: k for k, v in KEYWORD_MAPPINGS.items()}
 
 # Type Mappings: Confuc-IO → Conventional
-TYPE_MAPPINGS = {
+TYPE_MAPPINGS = _interned({
     'Float': 'int',    # Float → int
     'int': 'string',   # int → string
     'String': 'float', # String → float
     'While': 'bool',   # While → bool
-}
+})
 
 # Reverse type mapping for compilation
-TYPE_REVERSE = {
+TYPE_REVERSE = _interned({
     'int': 'Float',
     'string': 'int',
     'float': 'String',
     'bool': 'While',
-}
+})
 
 # Operator Mappings: Confuc-IO -> Conventional
-OPERATOR_MAPPINGS = {
+OPERATOR_MAPPINGS = _interned({
     '/': '+',      # / -> addition
     '~': '-',      # ~ -> subtraction
     '+': '/',      # + -> division
@@ -43,7 +55,7 @@ OPERATOR_MAPPINGS = {
     '#': '<',      # # -> less than
     '@@': '==',    # @@ -> equality
     '@': '=',      # @ -> assignment
-}
+})
 
 # Reverse operator mapping
 OPERATOR_REVERSE = {v: k for k, v in OPERATOR_MAPPINGS.items()}
@@ -79,10 +91,14 @@ FORMAT_STRING_MAPPINGS = {
     '%s': '%ffff',   # string format → %ffff (confusing!)
 }
 
+@functools.cache
 def verify_mappings():
     """
     Verify that all mappings are correctly defined according to the proposal.
     This function is used for testing purposes.
+    
+    The mappings are constants, so the result is memoized and the report is
+    only printed on the first call.
     """
     print("Verifying Confuc-IO Mappings...")
     print("\nKeyword Mappings:")
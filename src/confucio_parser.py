@@ -4,36 +4,87 @@ Confuc-IO Parser
 Uses Lark to parse Confuc-IO source code according to the grammar.
 """
 
-from lark import Lark, Tree
+import functools
+import sys
+from lark import Lark, Transformer, __version__ as LARK_VERSION
 from pathlib import Path
 
+from confucio_cache import default_cache_dir
+
+
+def grammar_cache_path():
+    """
+    Location of Lark's cached LALR tables, next to the AST cache.
+    
+    Lark stores a hash of the grammar and parser options inside the file and
+    rebuilds it automatically when the grammar changes. Falls back to Lark's
+    own temp-dir cache if the cache directory cannot be created.
+    """
+    cache_dir = default_cache_dir()
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        return True
+    py_version = f"{sys.version_info[0]}{sys.version_info[1]}"
+    return str(cache_dir / f"grammar-py{py_version}-lark{LARK_VERSION}.lark_cache")
+
+
+@functools.lru_cache(maxsize=4)
+def _load_parser(grammar_path: str, mtime: float, transformer: Transformer = None) -> Lark:
+    """
+    Build the Lark parser for a grammar file, once per (file, mtime, transformer)
+    
+    Every ConfucIOParser in the process shares the result; editing the grammar
+    changes its mtime and so builds a fresh parser.
+    """
+    with open(grammar_path, 'r', encoding='utf-8') as f:
+        grammar = f.read()
+    
+    # LALR(1) is linear-time; the compiled tables are cached on disk. The
+    # contextual lexer only tries the terminals valid in the parser state
+    return Lark(grammar, start='start', parser='lalr', lexer='contextual',
+                cache=grammar_cache_path(), transformer=transformer)
+
 
 class ConfucIOParser:
     """Parser for Confuc-IO source code using Lark"""
     
-    def __init__(self, grammar_file: str = None):
-        """Initialize the parser with the Confuc-IO grammar"""
+    def __init__(self, grammar_file: str = None, transformer: Transformer = None,
+                 cache_size: int = 128):
+        """
+        Initialize the parser with the Confuc-IO grammar
+        
+        If a transformer is given, Lark applies it while parsing (LALR
+        semantic actions) and parse() returns its result instead of a Tree.
+        
+        Results of parse() are memoized per source string, keeping at most
+        cache_size entries (None for no limit, 0 to disable). Memoization is
+        meant for long-lived embedders that re-parse the same sources; every
+        entry pins a whole tree in memory. Repeated sources get the same
+        result object back; results are read-only either way, since ASTs
+        share their small literal nodes (see confucio_ast_builder). The CLI
+        and parse_ast() pass 0: the on-disk cache already covers reuse
+        across runs, and a memo would only pin trees in memory.
+        """
         if grammar_file is None:
             # Default grammar file location
             grammar_path = Path(__file__).parent.parent / 'grammar' / 'confucio.lark'
         else:
             grammar_path = Path(grammar_file)
         
-        with open(grammar_path, 'r', encoding='utf-8') as f:
-            grammar = f.read()
-        
-        self.parser = Lark(grammar, start='start', parser='lalr')
+        self.parser = _load_parser(str(grammar_path.resolve()), grammar_path.stat().st_mtime, transformer)
+        self._parse = functools.lru_cache(maxsize=cache_size)(self.parser.parse)
     
-    def parse(self, source_code: str) -> Tree:
-        """Parse Confuc-IO source code and return AST"""
+    def parse(self, source_code: str):
+        """Parse Confuc-IO source code and return the parse tree (or transformer result)"""
         try:
-            tree = self.parser.parse(source_code)
+            tree = self._parse(source_code)
             return tree
         except Exception as e:
             print(f"Parse error: {e}")
             raise
     
-    def parse_file(self, filename: str) -> Tree:
+    def parse_file(self, filename: str):
         """Parse a Confuc-IO source file"""
         with open(filename, 'r', encoding='utf-8') as f:
             source = f.read()
@@ -12,11 +12,29 @@ Checks include:
 - Symbol table management
 """
 
-from typing import Dict, Set, Optional, List
+import sys
+from itertools import chain
+from typing import Callable, Dict, Set, Optional, List, Tuple
 from confucio_ast import *
 from confucio_mappings import MAIN_FUNCTION_NAME, TYPE_MAPPINGS
 
 
+# Confuc-IO type names a declaration may use
+_VALID_TYPES = frozenset(TYPE_MAPPINGS)
+
+# Python literal type -> Confuc-IO type name
+_LITERAL_TYPES = {
+    'int': 'Float',
+    'float': 'String',
+    'string': 'int',
+    'bool': 'While',
+}
+
+# Confuc-IO operators by category
+_ARITHMETIC_OPS = frozenset({'/', '~', '+', 'Bool'})
+_COMPARISON_OPS = frozenset({'=', '#', '@@'})
+
+
 class SemanticError(Exception):
     """Raised when semantic analysis fails"""
     pass
@@ -24,6 +42,8 @@ class SemanticError(Exception):
 
 class SymbolInfo:
     """Information about a symbol in the symbol table"""
+    __slots__ = ('name', 'type', 'is_initialized', 'line')
+    
     def __init__(self, name: str, symbol_type: str, is_initialized: bool = False, line: int = 0):
         self.name = name
         self.type = symbol_type
@@ -46,13 +66,19 @@ class SymbolTable:
     
     def declare_variable(self, name: str, var_type: str, initialized: bool, line: int):
         """Declare a variable - fails if already exists (no shadowing)"""
-        if name in self.symbols:
+        # Interned so later lookups and type compares hit the identity fast
+        # path; ASTs loaded from the pickle cache lose the builder's interning
+        name = sys.intern(name)
+        info = SymbolInfo(name, sys.intern(var_type), initialized, line)
+        
+        # Test and insert with a single probe; anything else already there
+        # means the name was declared before
+        existing = self.symbols.setdefault(name, info)
+        if existing is not info:
             raise SemanticError(
-                f"Line {line}: Variable '{name}' already declared at line {self.symbols[name].line}. "
+                f"Line {line}: Variable '{name}' already declared at line {existing.line}. "
                 f"Shadowing is not allowed in Confuc-IO (single global scope)."
             )
-        
-        self.symbols[name] = SymbolInfo(name, var_type, initialized, line)
     
     def get_variable(self, name: str) -> Optional[SymbolInfo]:
         """Get variable info"""
@@ -80,7 +106,7 @@ class SymbolTable:
                 f"Line {func_def.line}: Function '{name}' already declared. "
                 f"No shadowing allowed."
             )
-        self.functions[name] = func_def
+        self.functions[sys.intern(name)] = func_def
     
     def get_function(self, name: str) -> Optional[FunctionDef]:
         """Get function definition"""
@@ -95,49 +121,62 @@ class SemanticAnalyzer:
     the method visit_Foo is looked up via getattr and called.
     """
     
+    # Unbound visitor function per AST node class, filled in lazily by
+    # visit() and shared by every instance of the class
+    _visitor_cache: Dict[type, Callable] = {}
+    
+    def __init_subclass__(cls, **kwargs):
+        # Subclasses may override visitors, so each gets its own cache
+        super().__init_subclass__(**kwargs)
+        cls._visitor_cache = {}
+    
     def __init__(self):
         self.symbol_table = SymbolTable()
         self.current_function = None
-        self.has_main = False
-    
-    @staticmethod
-    def get_line(node) -> int:
-        """Safely get line number from AST node"""
-        return getattr(node, 'line', 0)
+        
+        # Function name -> (return type, parameter types), built in analyze()
+        self._signatures: Dict[str, Tuple[str, Tuple[str, ...]]] = {}
     
     def visit(self, node):
         """
         Dispatch to the appropriate visit_<ClassName> method via reflection.
         
-        For statement nodes, returns None.
+        For simple statement nodes, returns None; compound statements
+        (if/while/for) return the nested statements still to be visited.
         For expression nodes, returns the Confuc-IO type name (str).
+        
+        The method is looked up once per node class for the whole analyzer
+        class and then served from _visitor_cache, so each visit costs a
+        single dict lookup, even in a freshly created analyzer.
         """
-        method_name = f'visit_{type(node).__name__}'
-        visitor = getattr(self, method_name, None)
+        visitor = self._visitor_cache.get(type(node))
         if visitor is None:
-            raise SemanticError(f"No visitor method for AST node type: {type(node).__name__}")
-        return visitor(node)
+            method_name = f'visit_{type(node).__name__}'
+            visitor = getattr(type(self), method_name, None)
+            if visitor is None:
+                raise SemanticError(f"No visitor method for AST node type: {type(node).__name__}")
+            self._visitor_cache[type(node)] = visitor
+        return visitor(self, node)
     
     def analyze(self, ast: Program):
         """Perform semantic analysis on the program"""
         # First pass: collect all function declarations
         for func in ast.functions:
             self.symbol_table.declare_function(func.name, func)
-            
-            # Check if this is the main function
-            if func.name == MAIN_FUNCTION_NAME:
-                self.has_main = True
-                # Verify main function signature
-                if func.parameters:
-                    raise SemanticError(
-                        f"Line {self.get_line(func)}: Main function '{MAIN_FUNCTION_NAME}' must have no parameters"
-                    )
+            self._signatures[func.name] = (
+                func.return_type, tuple(p.param_type for p in func.parameters)
+            )
         
-        # Verify main function exists
-        if not self.has_main:
+        # Verify main function exists and takes no parameters
+        main = self.symbol_table.functions.get(MAIN_FUNCTION_NAME)
+        if main is None:
             raise SemanticError(
                 f"Program must have a main function named '{MAIN_FUNCTION_NAME}'"
             )
+        if main.parameters:
+            raise SemanticError(
+                f"Line {main.line}: Main function '{MAIN_FUNCTION_NAME}' must have no parameters"
+            )
         
         # Second pass: analyze function bodies
         for func in ast.functions:
@@ -147,8 +186,11 @@ class SemanticAnalyzer:
         """Analyze a function definition"""
         self.current_function = func
         
-        # Save current variables (parameters should be function-local)
-        saved_variables = self.symbol_table.symbols.copy()
+        # Parameters and body declarations are function-local. Analysis only
+        # ever adds symbols, and dicts keep insertion order, so everything
+        # past this size is dropped again once the body has been checked
+        symbols = self.symbol_table.symbols
+        outer_count = len(symbols)
         
         # Add parameters to symbol table as initialized
         for param in func.parameters:
@@ -160,60 +202,79 @@ class SemanticAnalyzer:
             )
         
         # Analyze function body using visitor dispatch
-        for stmt in func.body:
-            self.visit(stmt)
+        self.analyze_body(func.body)
         
-        # Restore variables (remove parameters from global scope)
-        self.symbol_table.symbols = saved_variables
+        # Remove this function's parameters and locals, newest first
+        while len(symbols) > outer_count:
+            symbols.popitem()
+    
+    def analyze_body(self, body: List[Statement]):
+        """
+        Visit a statement list and everything nested in it, in source order.
+        
+        Compound statement visitors hand back their nested statements rather
+        than visiting them, so arbitrarily deep nesting is walked here with
+        an explicit stack of iterators instead of Python recursion.
+        """
+        visit = self.visit
+        stack = [iter(body)]
+        while stack:
+            for stmt in stack[-1]:
+                nested = visit(stmt)
+                if nested is not None:
+                    # Suspend this list; resume it once the nested one is done
+                    stack.append(iter(nested))
+                    break
+            else:
+                stack.pop()
     
     # ── Statement visitors ──────────────────────────────────────────
     
     def visit_VarDeclaration(self, decl: VarDeclaration):
         """Visit variable declaration"""
         # Check if type is valid
-        if decl.var_type not in TYPE_MAPPINGS:
+        if decl.var_type not in _VALID_TYPES:
             raise SemanticError(
-                f"Line {self.get_line(decl)}: Unknown type '{decl.var_type}'"
+                f"Line {decl.line}: Unknown type '{decl.var_type}'"
             )
         
         # If there's an initializer, analyze it
         initialized = False
         if decl.initializer:
             init_type = self.visit(decl.initializer)
-            # Type checking
-            if not self.types_compatible(decl.var_type, init_type):
+            # Type checking: types must match exactly, there are no implicit
+            # conversions between Confuc-IO types
+            if decl.var_type != init_type:
                 raise SemanticError(
-                    f"Line {self.get_line(decl)}: Type mismatch in declaration of '{decl.name}'. "
+                    f"Line {decl.line}: Type mismatch in declaration of '{decl.name}'. "
                     f"Expected {decl.var_type}, got {init_type}"
                 )
             initialized = True
         
         # Declare variable (will fail if already exists due to no shadowing rule)
-        self.symbol_table.declare_variable(decl.name, decl.var_type, initialized, getattr(decl, 'line', 0))
+        self.symbol_table.declare_variable(decl.name, decl.var_type, initialized, decl.line)
     
     def visit_Assignment(self, assign: Assignment):
         """Visit assignment statement"""
-        # Check if variable is declared
-        if not self.symbol_table.is_declared(assign.name):
+        # Check if variable is declared (one lookup serves the whole visit)
+        var_info = self.symbol_table.symbols.get(assign.name)
+        if var_info is None:
             raise SemanticError(
-                f"Line {self.get_line(assign)}: Variable '{assign.name}' used before declaration"
+                f"Line {assign.line}: Variable '{assign.name}' used before declaration"
             )
         
         # Analyze right-hand side expression
         value_type = self.visit(assign.value)
         
-        # Get variable type
-        var_info = self.symbol_table.get_variable(assign.name)
-        
         # Type checking
-        if not self.types_compatible(var_info.type, value_type):
+        if var_info.type != value_type:
             raise SemanticError(
-                f"Line {self.get_line(assign)}: Type mismatch in assignment to '{assign.name}'. "
+                f"Line {assign.line}: Type mismatch in assignment to '{assign.name}'. "
                 f"Expected {var_info.type}, got {value_type}"
             )
         
         # Mark as initialized
-        self.symbol_table.mark_initialized(assign.name)
+        var_info.is_initialized = True
     
     def visit_IfStatement(self, if_stmt: IfStatement):
         """Visit if statement"""
@@ -225,23 +286,18 @@ class SemanticAnalyzer:
             # Allow comparisons that produce booleans
             pass
         
-        # Analyze then body
-        for stmt in if_stmt.then_body:
-            self.visit(stmt)
-        
-        # Analyze else body if present
+        # Then body, followed by the else body if present
         if if_stmt.else_body:
-            for stmt in if_stmt.else_body:
-                self.visit(stmt)
+            return chain(if_stmt.then_body, if_stmt.else_body)
+        return if_stmt.then_body
     
     def visit_WhileLoop(self, while_stmt: WhileLoop):
         """Visit while loop"""
         # Analyze condition
         self.visit(while_stmt.condition)
         
-        # Analyze body
-        for stmt in while_stmt.body:
-            self.visit(stmt)
+        # Body is visited by analyze_body
+        return while_stmt.body
     
     def visit_ForLoop(self, for_stmt: ForLoop):
         """Visit for loop"""
@@ -254,9 +310,8 @@ class SemanticAnalyzer:
         # Analyze update
         self.visit(for_stmt.update)
         
-        # Analyze body
-        for stmt in for_stmt.body:
-            self.visit(stmt)
+        # Body is visited by analyze_body
+        return for_stmt.body
     
     def visit_ReturnStatement(self, ret_stmt: ReturnStatement):
         """Visit return statement"""
@@ -272,13 +327,14 @@ class SemanticAnalyzer:
     def visit_InputStatement(self, input_stmt: InputStatement):
         """Visit input statement (deleteSystem32)"""
         # Check if variable is declared
-        if not self.symbol_table.is_declared(input_stmt.variable_name):
+        var_info = self.symbol_table.symbols.get(input_stmt.variable_name)
+        if var_info is None:
             raise SemanticError(
                 f"Variable '{input_stmt.variable_name}' used in input statement before declaration"
             )
         
         # Mark variable as initialized (reading input initializes it)
-        self.symbol_table.mark_initialized(input_stmt.variable_name)
+        var_info.is_initialized = True
 
     def visit_ExpressionStatement(self, stmt: ExpressionStatement):
         """Visit expression used as statement"""
@@ -289,29 +345,23 @@ class SemanticAnalyzer:
     def visit_Literal(self, lit: Literal) -> str:
         """Visit literal — returns Confuc-IO type name"""
         # Map literal type to Confuc-IO type
-        type_map = {
-            'int': 'Float',
-            'float': 'String',
-            'string': 'int',
-            'bool': 'While'
-        }
-        return type_map.get(lit.literal_type, lit.literal_type)
+        return _LITERAL_TYPES.get(lit.literal_type, lit.literal_type)
     
     def visit_Identifier(self, ident: Identifier) -> str:
         """Visit identifier — returns Confuc-IO type name"""
-        # Check if variable is declared
-        if not self.symbol_table.is_declared(ident.name):
+        # Check if variable is declared (one lookup serves the whole visit)
+        var_info = self.symbol_table.symbols.get(ident.name)
+        if var_info is None:
             raise SemanticError(
-                f"Line {self.get_line(ident)}: Variable '{ident.name}' used before declaration"
+                f"Line {ident.line}: Variable '{ident.name}' used before declaration"
             )
         
         # Check if variable is initialized
-        if not self.symbol_table.is_initialized(ident.name):
+        if not var_info.is_initialized:
             raise SemanticError(
-                f"Line {self.get_line(ident)}: Variable '{ident.name}' used before initialization"
+                f"Line {ident.line}: Variable '{ident.name}' used before initialization"
             )
         
-        var_info = self.symbol_table.get_variable(ident.name)
         return var_info.type
     
     def visit_BinaryOp(self, binop: BinaryOp) -> str:
@@ -320,17 +370,17 @@ class SemanticAnalyzer:
         right_type = self.visit(binop.right)
         
         # For arithmetic operators, types should match
-        if binop.operator in ['/', '~', '+', 'Bool']:  # Confuc-IO arithmetic ops
-            if not self.types_compatible(left_type, right_type):
+        if binop.operator in _ARITHMETIC_OPS:
+            if left_type != right_type:
                 raise SemanticError(
-                    f"Line {self.get_line(binop)}: Type mismatch in binary operation. "
+                    f"Line {binop.line}: Type mismatch in binary operation. "
                     f"Left type: {left_type}, Right type: {right_type}"
                 )
             # Return the common type
             return left_type
         
         # For comparison operators, return boolean
-        elif binop.operator in ['=', '#', '@@']:  # Confuc-IO comparison ops
+        elif binop.operator in _COMPARISON_OPS:
             return 'While'  # Boolean type in Confuc-IO
         
         return left_type
@@ -338,42 +388,33 @@ class SemanticAnalyzer:
     def visit_FunctionCall(self, call: FunctionCall) -> str:
         """Visit function call — returns Confuc-IO type name"""
         # Check if function exists
-        func = self.symbol_table.get_function(call.function_name)
-        if func is None:
+        signature = self._signatures.get(call.function_name)
+        if signature is None:
             raise SemanticError(
-                f"Line {self.get_line(call)}: Undefined function '{call.function_name}'"
+                f"Line {call.line}: Undefined function '{call.function_name}'"
             )
+        return_type, param_types = signature
         
         # Check argument count
-        if len(call.arguments) != len(func.parameters):
+        if len(call.arguments) != len(param_types):
             raise SemanticError(
-                f"Line {self.get_line(call)}: Function '{call.function_name}' expects {len(func.parameters)} arguments, "
+                f"Line {call.line}: Function '{call.function_name}' expects {len(param_types)} arguments, "
                 f"got {len(call.arguments)}"
             )
         
         # Type check arguments
-        for i, (arg, param) in enumerate(zip(call.arguments, func.parameters)):
+        for i, (arg, param_type) in enumerate(zip(call.arguments, param_types)):
             arg_type = self.visit(arg)
-            if not self.types_compatible(param.param_type, arg_type):
+            if param_type != arg_type:
                 raise SemanticError(
-                    f"Line {self.get_line(call)}: Argument {i+1} type mismatch in call to '{call.function_name}'. "
-                    f"Expected {param.param_type}, got {arg_type}"
+                    f"Line {call.line}: Argument {i+1} type mismatch in call to '{call.function_name}'. "
+                    f"Expected {param_type}, got {arg_type}"
                 )
         
-        return func.return_type
+        return return_type
     
     # ── Helpers ─────────────────────────────────────────────────────
     
-    def types_compatible(self, expected: str, actual: str) -> bool:
-        """Check if two types are compatible"""
-        # Exact match
-        if expected == actual:
-            return True
-        
-        # In Confuc-IO, Float can accept int or string
-        # But we'll be strict for now
-        return False
-    
     def print_symbol_table(self):
         """Print the symbol table for debugging"""
         print("\n=== Symbol Table ===")
@@ -0,0 +1,98 @@
+"""
+Integration tests: compile and JIT-run the example and fixture programs
+in-process through cli.main(), sharing one interpreter, grammar load and
+LLVM initialization across all programs
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parent.parent.parent
+
+# Add repository root (cli.py) and src to path
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'src'))
+
+import cli
+
+
+# (program, exit code returned by its main function)
+PROGRAMS = [
+    ('examples/hello_world.cio', 0),
+    ('examples/arithmetic.cio', 0),
+    ('examples/fibonacci.cio', 3),
+    ('examples/strings.cio', 0),
+    ('examples/test_params.cio', 0),
+    ('tests/fixtures/basic/arithmetic.cio', 8),
+    ('tests/fixtures/basic/fibonacci.cio', 55),
+    ('tests/fixtures/control_flow/test_while_simple.cio', 0),
+    ('tests/fixtures/strings/test_string_simple.cio', 0),
+    ('tests/fixtures/strings/test_string_concat.cio', 0),
+    ('tests/fixtures/strings/test_string_quotes.cio', 0),
+    ('tests/fixtures/io/test_io_print.cio', 0),
+]
+
+ERROR_DIR = ROOT / 'tests' / 'fixtures' / 'errors'
+
+# Programs the compiler must reject, with the diagnostic each must produce
+ERROR_DIAGNOSTICS = {
+    'tests/fixtures/errors/missing_main.cio':
+        "Program must have a main function named 'side'",
+    'tests/fixtures/errors/shadowing.cio':
+        "Variable 'x' already declared",
+    'tests/fixtures/errors/type_mismatch.cio':
+        "Type mismatch in assignment to 'x'. Expected Float, got String",
+    'tests/fixtures/errors/undeclared_variable.cio':
+        "Variable 'y' used before declaration",
+    'tests/fixtures/errors/uninitialized.cio':
+        "Variable 'x' used before initialization",
+}
+
+# The grammar requires an initializer on every declaration, so this fixture
+# fails to parse before the initialization check can run
+UNREACHABLE_DIAGNOSTICS = {'tests/fixtures/errors/uninitialized.cio'}
+
+ERROR_PROGRAMS = [
+    pytest.param(program, message, marks=pytest.mark.xfail(
+        strict=True, reason="declaration without initializer does not parse"))
+    if program in UNREACHABLE_DIAGNOSTICS else (program, message)
+    for program, message in ERROR_DIAGNOSTICS.items()
+]
+
+
+def run_cli(monkeypatch, tmp_path, *argv):
+    """Invoke cli.main() with the given arguments and an isolated cache"""
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    monkeypatch.setattr(sys, 'argv', ['cli.py', *argv])
+    return cli.main()
+
+
+@pytest.mark.parametrize('program, exit_code', PROGRAMS)
+def test_program_runs(program, exit_code, monkeypatch, tmp_path, capfd):
+    assert run_cli(monkeypatch, tmp_path, str(ROOT / program)) == 0
+    out, _ = capfd.readouterr()
+    assert f"Program exited with code: {exit_code}" in out
+
+
+@pytest.mark.parametrize('program, message', ERROR_PROGRAMS)
+def test_program_rejected(program, message, monkeypatch, tmp_path, capfd):
+    assert run_cli(monkeypatch, tmp_path, str(ROOT / program)) == 1
+    _, err = capfd.readouterr()
+    # A rejection, not an internal crash caught by compile_file's catch-all
+    assert "Semantic error:" in err
+    assert message in err
+
+
+def test_every_error_fixture_has_a_diagnostic():
+    on_disk = {str(p.relative_to(ROOT)) for p in ERROR_DIR.glob('*.cio')}
+    assert set(ERROR_DIAGNOSTICS) == on_disk
+
+
+def test_string_quotes_stripped(monkeypatch, tmp_path, capfd):
+    program = ROOT / 'tests' / 'fixtures' / 'strings' / 'test_string_quotes.cio'
+    assert run_cli(monkeypatch, tmp_path, str(program)) == 0
+    out, _ = capfd.readouterr()
+    assert "\ndouble quoted\n" in out
+    assert "\nsingle quoted\n" in out
@@ -0,0 +1,17 @@
+"""
+Shared pytest configuration for the Confuc-IO unit tests
+"""
+
+import sys
+from pathlib import Path
+
+# Make the compiler modules in src/ importable from every unit test module
+SRC_DIR = Path(__file__).parent.parent.parent / 'src'
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "fast: pure, dependency-free tests; select with -m fast"
+    )
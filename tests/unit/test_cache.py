@@ -0,0 +1,75 @@
+"""
+Test suite for the Confuc-IO parse tree/AST and JIT object caches
+"""
+
+# src/ is put on sys.path by tests/unit/conftest.py
+import confucio_cache
+from confucio_ast import Program, FunctionDef, ReturnStatement, Literal
+from confucio_cache import CompilationCache, ObjectCache
+
+
+SOURCE = b"Float side {] [\n    * 0\n)\n"
+
+
+def make_program():
+    return Program(functions=[
+        FunctionDef(
+            return_type='Float',
+            name='side',
+            parameters=[],
+            body=[ReturnStatement(value=Literal(value=0, literal_type='int'))]
+        )
+    ])
+
+
+class TestCompilationCache:
+    """Test on-disk caching of parse trees and ASTs"""
+    
+    def test_miss_then_hit(self, tmp_path):
+        cache = CompilationCache(tmp_path)
+        key = cache.key(SOURCE)
+        assert cache.load(key) is None
+        
+        cache.store(key, 'tree', make_program())
+        parse_tree, ast = cache.load(key)
+        
+        assert parse_tree == 'tree'
+        assert ast.functions[0].name == 'side'
+        assert (cache.hits, cache.misses) == (1, 1)
+    
+    def test_key_depends_on_source(self, tmp_path):
+        cache = CompilationCache(tmp_path)
+        assert cache.key(SOURCE) != cache.key(SOURCE + b"\n")
+    
+    def test_corrupt_entry_is_a_miss(self, tmp_path):
+        cache = CompilationCache(tmp_path)
+        key = cache.key(SOURCE)
+        (tmp_path / f"{key}.ast.pkl").write_bytes(b"not a pickle")
+        assert cache.load(key) is None
+
+
+class TestObjectCache:
+    """Test on-disk caching of JIT object code"""
+    
+    def test_miss_then_hit(self, tmp_path):
+        cache = ObjectCache(tmp_path)
+        key = cache.key("define i32 @main()", 0, False)
+        assert cache.load(key) is None
+        
+        cache.store(key, b"\x7fELF")
+        assert cache.load(key) == b"\x7fELF"
+        assert (cache.hits, cache.misses) == (1, 1)
+    
+    def test_key_depends_on_settings(self, tmp_path):
+        cache = ObjectCache(tmp_path)
+        assert cache.key("ir", 0, False) != cache.key("ir", 2, False)
+        assert cache.key("ir", 0, False) != cache.key("ir", 0, True)
+    
+    def test_key_depends_on_codegen(self, tmp_path, monkeypatch):
+        codegen = tmp_path / 'confucio_codegen.py'
+        codegen.write_text("pm.add_sroa_pass()\n")
+        monkeypatch.setattr(confucio_cache, '_BACKEND_FILES', (codegen,))
+        before = ObjectCache(tmp_path).key("ir", 0, False)
+        
+        codegen.write_text("pm.add_sroa_pass()\npm.add_new_gvn_pass()\n")
+        assert ObjectCache(tmp_path).key("ir", 0, False) != before
@@ -6,7 +6,7 @@ Demonstrates the complete operator mapping translation
 import sys
 from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
 
 from confucio_ast import *
 from confucio_codegen import CodeGenerator, CodeGenError
@@ -245,11 +245,225 @@ def test_comparison_operators():
     print("\n✓ All comparison operator mappings verified!")
 
 
+def test_string_constants_deduplicated():
+    """Test that each distinct string is emitted as a single global"""
+    
+    print("\n=== Testing String Constant Deduplication ===\n")
+    
+    program = Program(
+        functions=[
+            FunctionDef(
+                return_type='Float',
+                name='side',
+                parameters=[],
+                body=[
+                    PrintStatement(expressions=[Literal(value='hello', literal_type='string')]),
+                    PrintStatement(expressions=[Literal(value='hello', literal_type='string')]),
+                    PrintStatement(expressions=[Literal(value=1, literal_type='int')]),
+                    PrintStatement(expressions=[Literal(value=2, literal_type='int')]),
+                    ReturnStatement(value=Literal(value=0, literal_type='int'))
+                ]
+            )
+        ]
+    )
+    
+    codegen = CodeGenerator()
+    ir_code = codegen.generate(program)
+    
+    globals_by_value = {}
+    for line in ir_code.splitlines():
+        if line.startswith('@"str_'):
+            value = line.split(' c"', 1)[1]
+            globals_by_value[value] = globals_by_value.get(value, 0) + 1
+    
+    assert globals_by_value, "Expected string constants in IR"
+    for value, count in globals_by_value.items():
+        assert count == 1, f"String c\"{value} emitted {count} times"
+        print(f"  ✓ c\"{value} emitted once")
+    
+    print("\n✓ String constants are deduplicated!")
+
+
+def test_locals_kept_in_ssa_form():
+    """Test that only scanf targets and block-assigned locals get a stack slot"""
+    
+    print("\n=== Testing SSA Locals ===\n")
+    
+    program = Program(
+        functions=[
+            FunctionDef(
+                return_type='Float',
+                name='side',
+                parameters=[],
+                body=[
+                    VarDeclaration(
+                        var_type='Float',
+                        name='a',
+                        initializer=Literal(value=10, literal_type='int')
+                    ),
+                    VarDeclaration(
+                        var_type='Float',
+                        name='n',
+                        initializer=Literal(value=0, literal_type='int')
+                    ),
+                    VarDeclaration(
+                        var_type='Float',
+                        name='i',
+                        initializer=Literal(value=0, literal_type='int')
+                    ),
+                    InputStatement(variable_name='n'),
+                    WhileLoop(
+                        condition=BinaryOp(
+                            operator='#',
+                            left=Identifier(name='i'),
+                            right=Identifier(name='n')
+                        ),
+                        body=[
+                            Assignment(
+                                name='i',
+                                value=BinaryOp(
+                                    operator='/',
+                                    left=Identifier(name='i'),
+                                    right=Identifier(name='a')
+                                )
+                            )
+                        ]
+                    ),
+                    ReturnStatement(value=Identifier(name='i'))
+                ]
+            )
+        ]
+    )
+    
+    codegen = CodeGenerator()
+    ir_code = codegen.generate(program)
+    
+    assert '%"a" = alloca' not in ir_code, "Straight-line local should not be stack allocated"
+    print("  ✓ a is an SSA value")
+    for name in ('n', 'i'):
+        assert f'%"{name}" = alloca' in ir_code, f"Expected a stack slot for {name}"
+        print(f"  ✓ {name} is stack allocated")
+    
+    print("\n✓ Locals use the cheapest storage that is correct!")
+
+
+def test_literal_arithmetic_folded():
+    """Test that operators on literals are folded into constants"""
+    
+    print("\n=== Testing Constant Folding ===\n")
+    
+    def lit(value):
+        return Literal(value=value, literal_type='int')
+    
+    program = Program(
+        functions=[
+            FunctionDef(
+                return_type='Float',
+                name='side',
+                parameters=[],
+                body=[
+                    # 0 - 7 / 2 (Confuc-IO: 0 ~ 7 + 2)
+                    ReturnStatement(value=BinaryOp(
+                        operator='~',
+                        left=lit(0),
+                        right=BinaryOp(operator='+', left=lit(7), right=lit(2))
+                    ))
+                ]
+            )
+        ]
+    )
+    
+    codegen = CodeGenerator()
+    ir_code = codegen.generate(program)
+    
+    assert 'ret i32 -3' in ir_code, "Expected 0 - 7 / 2 folded to -3 (sdiv truncates)"
+    assert 'sub i32' not in ir_code and 'sdiv i32' not in ir_code
+    print("  ✓ 0 ~ 7 + 2 folded to -3")
+    
+    print("\n✓ Literal arithmetic is folded!")
+
+
+def test_print_statement_single_call():
+    """Test that a print statement becomes one printf with a combined format"""
+    
+    print("\n=== Testing Print Statement ===\n")
+    
+    program = Program(
+        functions=[
+            FunctionDef(
+                return_type='Float',
+                name='side',
+                parameters=[],
+                body=[
+                    VarDeclaration(
+                        var_type='Float',
+                        name='x',
+                        initializer=Literal(value=42, literal_type='int')
+                    ),
+                    PrintStatement(expressions=[
+                        Literal(value='x is 100% ', literal_type='string'),
+                        Identifier(name='x')
+                    ]),
+                    ReturnStatement(value=Literal(value=0, literal_type='int'))
+                ]
+            )
+        ]
+    )
+    
+    codegen = CodeGenerator()
+    ir_code = codegen.generate(program)
+    
+    assert ir_code.count('call i32 (i8*, ...) @"printf"') == 1, "Expected a single printf call"
+    assert 'c"x is 100%% %d\\0a\\00"' in ir_code, "Expected literal text and %d in one format string"
+    print("  ✓ one printf with format \"x is 100%% %d\\n\"")
+    
+    print("\n✓ Print statements are emitted as a single call!")
+
+
+def test_plain_text_print_uses_puts():
+    """Test that printing only string literals calls puts, not printf"""
+    
+    print("\n=== Testing Plain Text Print ===\n")
+    
+    program = Program(
+        functions=[
+            FunctionDef(
+                return_type='Float',
+                name='side',
+                parameters=[],
+                body=[
+                    PrintStatement(expressions=[
+                        Literal(value='Hello, ', literal_type='string'),
+                        Literal(value='World', literal_type='string')
+                    ]),
+                    PrintStatement(expressions=[]),
+                    ReturnStatement(value=Literal(value=0, literal_type='int'))
+                ]
+            )
+        ]
+    )
+    
+    codegen = CodeGenerator()
+    ir_code = codegen.generate(program)
+    
+    assert '@"printf"' not in ir_code, "printf should not be declared"
+    assert ir_code.count('call i32 @"puts"') == 2, "Expected one puts call per print"
+    assert 'c"Hello, World\\00"' in ir_code
+    print("  ✓ plain text and empty prints use puts")
+    
+    print("\n✓ Plain text prints skip printf!")
+
+
 if __name__ == '__main__':
     try:
         test_operator_mapping_in_codegen()
         test_all_arithmetic_operators()
         test_comparison_operators()
+        test_string_constants_deduplicated()
+        test_locals_kept_in_ssa_form()
+        test_literal_arithmetic_folded()
+        test_print_statement_single_call()
+        test_plain_text_print_uses_puts()
         
         print("\n" + "="*60)
         print("✓ ALL CODE GENERATION TESTS PASSED!")
@@ -4,106 +4,96 @@ Verifies all mappings match the proposal specification
 """
 
 import pytest
-import sys
-from pathlib import Path
-
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+from types import MappingProxyType
 
+# src/ is put on sys.path by tests/unit/conftest.py
 from confucio_mappings import (
     KEYWORD_MAPPINGS,
+    KEYWORD_REVERSE,
     TYPE_MAPPINGS,
+    TYPE_REVERSE,
     OPERATOR_MAPPINGS,
+    OPERATOR_REVERSE,
     DELIMITER_MAPPINGS,
+    DELIMITER_REVERSE,
     COMMENT_SYMBOL,
     MAIN_FUNCTION_NAME,
     verify_mappings
 )
 
 
-class TestKeywordMappings:
-    """Test keyword mappings against proposal specification"""
-    
-    def test_func_maps_to_if(self):
-        assert KEYWORD_MAPPINGS['func'] == 'if'
-    
-    def test_for_maps_to_func(self):
-        assert KEYWORD_MAPPINGS['for'] == 'func'
-    
-    def test_return_maps_to_while(self):
-        assert KEYWORD_MAPPINGS['return'] == 'while'
-    
-    def test_if_maps_to_for(self):
-        assert KEYWORD_MAPPINGS['if'] == 'for'
-    
-    def test_star_maps_to_return(self):
-        assert KEYWORD_MAPPINGS['*'] == 'return'
+# Read-only checks of constant tables: cheap, and safe to run in parallel
+pytestmark = pytest.mark.fast
 
 
-class TestTypeMappings:
-    """Test type mappings against proposal specification"""
-    
-    def test_Float_maps_to_int(self):
-        assert TYPE_MAPPINGS['Float'] == 'int'
-    
-    def test_int_maps_to_string(self):
-        assert TYPE_MAPPINGS['int'] == 'string'
-    
-    def test_String_maps_to_float(self):
-        assert TYPE_MAPPINGS['String'] == 'float'
-    
-    def test_While_maps_to_bool(self):
-        assert TYPE_MAPPINGS['While'] == 'bool'
+# Expected mappings, straight from the proposal specification. Read-only
+# views, so no test can alter the reference data another test relies on
+EXPECTED_KEYWORDS = MappingProxyType({
+    'func': 'if',
+    'for': 'func',
+    'return': 'while',
+    'if': 'for',
+    '*': 'return',
+})
 
+EXPECTED_TYPES = MappingProxyType({
+    'Float': 'int',
+    'int': 'string',
+    'String': 'float',
+    'While': 'bool',
+})
 
-class TestOperatorMappings:
-    """Test operator mappings against proposal specification"""
-    
-    def test_slash_maps_to_addition(self):
-        assert OPERATOR_MAPPINGS['/'] == '+'
-    
-    def test_tilde_maps_to_subtraction(self):
-        assert OPERATOR_MAPPINGS['~'] == '-'
-    
-    def test_plus_maps_to_division(self):
-        assert OPERATOR_MAPPINGS['+'] == '/'
-    
-    def test_Bool_maps_to_multiplication(self):
-        assert OPERATOR_MAPPINGS['Bool'] == '*'
-    
-    def test_equals_maps_to_greater_than(self):
-        assert OPERATOR_MAPPINGS['='] == '>'
-    
-    def test_hash_maps_to_less_than(self):
-        assert OPERATOR_MAPPINGS['#'] == '<'
-    
-    def test_double_at_maps_to_equality(self):
-        assert OPERATOR_MAPPINGS['@@'] == '=='
-    
-    def test_at_maps_to_assignment(self):
-        assert OPERATOR_MAPPINGS['@'] == '='
+EXPECTED_OPERATORS = MappingProxyType({
+    '/': '+',      # addition
+    '~': '-',      # subtraction
+    '+': '/',      # division
+    'Bool': '*',   # multiplication
+    '=': '>',      # greater than
+    '#': '<',      # less than
+    '@@': '==',    # equality
+    '@': '=',      # assignment
+})
 
+EXPECTED_DELIMITERS = MappingProxyType({
+    '{': '(',
+    ']': ')',
+    '(': '[',
+    '}': ']',
+    '[': '{',
+    ')': '}',
+})
+
+
+@pytest.mark.parametrize('key, expected', EXPECTED_KEYWORDS.items())
+def test_keyword_mapping(key, expected):
+    assert KEYWORD_MAPPINGS[key] == expected
 
-class TestDelimiterMappings:
-    """Test delimiter mappings against proposal specification"""
-    
-    def test_lcurly_maps_to_lparen(self):
-        assert DELIMITER_MAPPINGS['{'] == '('
-    
-    def test_rbracket_maps_to_rparen(self):
-        assert DELIMITER_MAPPINGS[']'] == ')'
-    
-    def test_lparen_maps_to_lbracket(self):
-        assert DELIMITER_MAPPINGS['('] == '['
-    
-    def test_rcurly_maps_to_rbracket(self):
-        assert DELIMITER_MAPPINGS['}'] == ']'
-    
-    def test_lbracket_maps_to_lcurly(self):
-        assert DELIMITER_MAPPINGS['['] == '{'
-    
-    def test_rparen_maps_to_rcurly(self):
-        assert DELIMITER_MAPPINGS[')'] == '}'
+
+@pytest.mark.parametrize('key, expected', EXPECTED_TYPES.items())
+def test_type_mapping(key, expected):
+    assert TYPE_MAPPINGS[key] == expected
+
+
+@pytest.mark.parametrize('key, expected', EXPECTED_OPERATORS.items())
+def test_operator_mapping(key, expected):
+    assert OPERATOR_MAPPINGS[key] == expected
+
+
+@pytest.mark.parametrize('key, expected', EXPECTED_DELIMITERS.items())
+def test_delimiter_mapping(key, expected):
+    assert DELIMITER_MAPPINGS[key] == expected
+
+
+@pytest.mark.parametrize('forward, reverse', [
+    (KEYWORD_MAPPINGS, KEYWORD_REVERSE),
+    (TYPE_MAPPINGS, TYPE_REVERSE),
+    (OPERATOR_MAPPINGS, OPERATOR_REVERSE),
+    (DELIMITER_MAPPINGS, DELIMITER_REVERSE),
+], ids=['keyword', 'type', 'operator', 'delimiter'])
+def test_reverse_mapping_is_inverse(forward, reverse):
+    # Covers every entry, including ones added later; also fails if two
+    # Confuc-IO symbols map to the same conventional one
+    assert reverse == {v: k for k, v in forward.items()}
 
 
 class TestSpecialSymbols:
@@ -119,5 +109,11 @@ class TestSpecialSymbols:
 class TestMappingVerification:
     """Test mapping verification function"""
     
+    def test_tables_match_specification(self):
+        # Whole-table equality also catches entries the proposal does not have
+        actual = (KEYWORD_MAPPINGS, TYPE_MAPPINGS, OPERATOR_MAPPINGS, DELIMITER_MAPPINGS)
+        expected = (EXPECTED_KEYWORDS, EXPECTED_TYPES, EXPECTED_OPERATORS, EXPECTED_DELIMITERS)
+        assert actual == expected
+    
     def test_verify_mappings_passes(self):
         assert verify_mappings() is True